@@ -0,0 +1,342 @@
+# api_server.py
+
+import argparse
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+from config import (API_HOST, API_PORT, API_PAGE_SIZE, API_MAX_PAGE_SIZE, DATA_FILE, RECURRING_PAYMENTS_FILE,
+                    REFRESH_INTERVAL_MS)
+from data_manager import FinanceManager
+from money import to_minor, format_minor
+
+MAX_BODY_SIZE = 1024 * 1024
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ReadWriteLock:
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    async def acquire_read(self):
+        async with self._cond:
+            # Writers waiting take precedence so a steady stream of readers cannot starve them.
+            await self._cond.wait_for(lambda: not self._writer and not self._waiting_writers)
+            self._readers += 1
+
+    async def release_read(self):
+        async with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    async def acquire_write(self):
+        async with self._cond:
+            self._waiting_writers += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+
+    async def release_write(self):
+        async with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def read_locked(self):
+        await self.acquire_read()
+        try:
+            yield
+        finally:
+            await self.release_read()
+
+    @asynccontextmanager
+    async def write_locked(self):
+        await self.acquire_write()
+        try:
+            yield
+        finally:
+            await self.release_write()
+
+
+def _query_date(query, name):
+    value = query.get(name, [None])[0]
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPError(400, f"Неправильний формат дати '{name}'. Використовуйте РРРР-ММ-ДД.")
+
+
+def _query_int(query, name, default):
+    value = query.get(name, [None])[0]
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HTTPError(400, f"Параметр '{name}' має бути цілим числом.")
+    if number < 0:
+        raise HTTPError(400, f"Параметр '{name}' не може бути від'ємним.")
+    return number
+
+
+def _date_range(query):
+    start_dt = _query_date(query, "start")
+    end_dt = _query_date(query, "end")
+    if (start_dt is None) != (end_dt is None):
+        raise HTTPError(400, "Для запиту за період потрібні обидва параметри: start та end.")
+    if start_dt is not None and start_dt > end_dt:
+        raise HTTPError(400, "Початкова дата не може бути пізніше кінцевої дати.")
+    return start_dt, end_dt
+
+
+def _format_amounts(amounts):
+    return {key: format_minor(value) for key, value in amounts.items()}
+
+
+def _transaction_to_json(t):
+    return dict(t, amount=format_minor(t["amount_minor"]))
+
+
+def _summary_to_json(summary):
+    return {
+        "count": summary["count"],
+        "totals": _format_amounts(summary["totals"]),
+        "categories": {type_trans: _format_amounts(categories)
+                       for type_trans, categories in summary["categories"].items()}
+    }
+
+
+class FinanceAPIServer:
+    def __init__(self, manager, host=API_HOST, port=API_PORT):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.lock = ReadWriteLock()
+        self._server = None
+        self._refresh_task = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+        return self._server
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            self._refresh_task.cancel()
+
+    async def _refresh_loop(self):
+        # Picks up writes made by the GUI or scripts sharing the same data file.
+        while True:
+            await asyncio.sleep(REFRESH_INTERVAL_MS / 1000)
+            if self.manager.has_external_changes():
+                async with self.lock.write_locked():
+                    await asyncio.to_thread(self.manager.refresh)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    # StreamReader raises ValueError for lines longer than its 64 KiB limit.
+                    self._write_response(writer, 400, {"error": "Рядок запиту задовгий."}, False)
+                    await writer.drain()
+                    break
+                if not request_line:
+                    break
+                keep_alive = await self._handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, request_line, reader, writer):
+        headers = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                self._write_response(writer, 400, {"error": "Заголовок запиту задовгий."}, False)
+                return False
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self._write_response(writer, 400, {"error": "Неправильний рядок запиту."}, False)
+            return False
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._write_response(writer, 400, {"error": "Неправильний заголовок Content-Length."}, False)
+            return False
+        if length > MAX_BODY_SIZE:
+            self._write_response(writer, 413, {"error": "Тіло запиту завелике."}, False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        try:
+            status, payload = await self._dispatch(method, target, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": f"Сталася неочікувана помилка: {e}"}
+        self._write_response(writer, status, payload, keep_alive)
+        return keep_alive
+
+    def _write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["balance"] and method == "GET":
+            async with self.lock.read_locked():
+                return 200, {"balance": format_minor(self.manager.get_balance())}
+
+        if parts == ["categories"] and method == "GET":
+            type_trans = query.get("type", ["Витрата"])[0]
+            start_dt, end_dt = _date_range(query)
+            async with self.lock.read_locked():
+                return 200, {"type": type_trans,
+                             "totals": _format_amounts(self.manager.get_category_totals(type_trans, start_dt, end_dt))}
+
+        if parts == ["summary"] and method == "GET":
+            start_dt, end_dt = _date_range(query)
+            async with self.lock.read_locked():
+                return 200, _summary_to_json(self.manager.get_summary(start_dt, end_dt))
+
+        if parts == ["transactions"] and method == "GET":
+            start_dt, end_dt = _date_range(query)
+            offset = _query_int(query, "offset", 0)
+            # Pages are bounded: encoding the whole ledger would hold up every other connection on the loop.
+            limit = min(_query_int(query, "limit", API_PAGE_SIZE), API_MAX_PAGE_SIZE)
+            async with self.lock.read_locked():
+                total, page = self.manager.get_transactions_page(offset, limit, start_dt, end_dt)
+                return 200, {"total": total, "offset": offset, "limit": limit,
+                             "transactions": [_transaction_to_json(t) for t in page]}
+
+        if parts == ["transactions"] and method == "POST":
+            data = self._parse_transaction(body)
+            async with self.lock.write_locked():
+                transaction = await asyncio.to_thread(self.manager.add_transaction, **data)
+                if transaction is None:
+                    raise HTTPError(400, "Транзакція з таким ідентифікатором вже існує.")
+                return 201, _transaction_to_json(transaction)
+
+        if len(parts) == 2 and parts[0] == "transactions" and method == "DELETE":
+            trans_id = parts[1]
+            async with self.lock.write_locked():
+                if not self.manager.has_transaction(trans_id):
+                    raise HTTPError(404, "Транзакцію не знайдено.")
+                await asyncio.to_thread(self.manager.delete_transaction_by_id, trans_id)
+                return 200, {"deleted": trans_id}
+
+        if parts in (["balance"], ["categories"], ["summary"], ["transactions"]) or (
+                len(parts) == 2 and parts[0] == "transactions"):
+            raise HTTPError(405, "Метод не підтримується.")
+        raise HTTPError(404, "Ресурс не знайдено.")
+
+    def _parse_transaction(self, body):
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HTTPError(400, "Тіло запиту має бути коректним JSON.")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Тіло запиту має бути JSON-об'єктом.")
+
+        missing = [k for k in ("amount", "category", "type", "date") if not str(data.get(k, "")).strip()]
+        if missing:
+            raise HTTPError(400, f"Пропущені обов'язкові поля: {', '.join(missing)}")
+        if data["type"] not in ("Доход", "Витрата"):
+            raise HTTPError(400, "Неправильний тип транзакції. Оберіть з: Доход, Витрата.")
+        try:
+            amount_minor = to_minor(str(data["amount"]))
+        except ValueError:
+            raise HTTPError(400, "Сума має бути числом.")
+        try:
+            date_str = datetime.strptime(data["date"], '%Y-%m-%d').strftime('%Y-%m-%d')
+        except (TypeError, ValueError):
+            raise HTTPError(400, "Неправильний формат дати. Використовуйте РРРР-ММ-ДД.")
+
+        return {
+            "amount_minor": amount_minor,
+            "cat": str(data["category"]).strip(),
+            "type_trans": data["type"],
+            "desc": str(data.get("description", "")).strip(),
+            "date_str": date_str
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="api_server.py", description="Локальний HTTP/JSON сервіс обліку фінансів.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--data", default=DATA_FILE, help="файл транзакцій")
+    parser.add_argument("--recurring", default=RECURRING_PAYMENTS_FILE, help="файл регулярних платежів")
+    args = parser.parse_args(argv)
+
+    manager = FinanceManager(args.data, args.recurring, process_recurring=False)
+    try:
+        asyncio.run(_serve(manager, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _serve(manager, host, port):
+    # The lock's asyncio primitives must be created inside the running loop.
+    server = FinanceAPIServer(manager, host, port)
+    await server.start()
+    print(f"Сервер запущено на http://{host}:{port}")
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
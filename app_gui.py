@@ -1,90 +1,119 @@
 import tkinter as tk
 from tkinter import messagebox, ttk, simpledialog, filedialog
 from datetime import datetime, timedelta
-from collections import defaultdict
 import calendar
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 from data_manager import FinanceManager
+from config import REFRESH_INTERVAL_MS, WATCH_DIR, WATCH_INTERVAL_MS
+from import_watcher import ImportWatcher
+from forecast import ForecastEngine
+from money import to_minor, format_minor, minor_to_float
 
 
 class FinanceApp:
     def __init__(self, root_window):
-        self.manager = FinanceManager()
+        self.manager = FinanceManager(track_changes=True)
+        self.forecast_engine = ForecastEngine(self.manager)
         self.root = root_window
         self.root.title("Облік фінансів")
         self.current_theme = "light"
 
         self.fig = None
         self.ax = None
+        self.ax_balance = None
         self.fig_canvas = None
         self.graph_win = None
         self.fig_canvas_widget = None
+        self._income_line = None
+        self._expense_line = None
+        self._balance_line = None
+        self._forecast_line = None
+        self._graph_background = None
+        self._graph_refresh_pending = False
+        self._filtered_view = False
 
         self._setup_styles()
         self._create_widgets()
         self.update_transactions_list()
         self.apply_theme()
+        self.root.after(REFRESH_INTERVAL_MS, self._poll_external_changes)
+
+        self.import_watcher = None
+        if WATCH_DIR:
+            self.import_watcher = ImportWatcher(self.manager, WATCH_DIR)
+            self.root.after(WATCH_INTERVAL_MS, self._poll_import_watcher)
 
     def _setup_styles(self):
         self.style = ttk.Style()
         self.light_colors = {
             "bg": "#F0F0F0", "fg": "black", "entry_bg": "white",
             "btn_bg": "#E0E0E0", "tree_bg": "white", "tree_fg": "black",
-            "tree_heading_bg": "#D0D0D0"
+            "tree_heading_bg": "#D0D0D0", "graph_bg": "white", "graph_fg": "black",
+            "graph_grid": "#B0B0B0", "legend_bg": "white"
         }
         self.dark_colors = {
             "bg": "#2E2E2E", "fg": "white", "entry_bg": "#3E3E3E",
             "btn_bg": "#4E4E4E", "tree_bg": "#3E3E3E", "tree_fg": "white",
-            "tree_heading_bg": "#5E5E5E"
+            "tree_heading_bg": "#5E5E5E", "graph_bg": "#2E2E2E", "graph_fg": "white",
+            "graph_grid": "#5E5E5E", "legend_bg": "#3E3E3E"
         }
 
-    def apply_theme(self):
-        colors = self.dark_colors if self.current_theme == "dark" else self.light_colors
-
-        self.root.configure(bg=colors["bg"])
-        self.style.theme_use('clam')
+        self._theme_names = {"light": "finance_light", "dark": "finance_dark"}
+        for theme, colors in (("light", self.light_colors), ("dark", self.dark_colors)):
+            if self._theme_names[theme] not in self.style.theme_names():
+                self.style.theme_create(self._theme_names[theme], parent="clam",
+                                        settings=self._theme_settings(colors))
+        # Plain tk windows are not styled by ttk themes; only these need recoloring on a switch.
+        self._themed_windows = [self.root]
+
+    def _theme_settings(self, colors):
+        return {
+            ".": {"configure": {"background": colors["bg"], "foreground": colors["fg"]}},
+            "TFrame": {"configure": {"background": colors["bg"]}},
+            "TLabelframe": {"configure": {"background": colors["bg"]}},
+            "TLabelframe.Label": {"configure": {"background": colors["bg"], "foreground": colors["fg"]}},
+            "TLabel": {"configure": {"background": colors["bg"], "foreground": colors["fg"]}},
+            "TButton": {
+                "configure": {"background": colors["btn_bg"], "foreground": colors["fg"], "borderwidth": 1},
+                "map": {"background": [('active', colors["btn_bg"])]}
+            },
+            "TEntry": {"configure": {"fieldbackground": colors["entry_bg"], "foreground": colors["fg"],
+                                     "insertcolor": colors["fg"]}},
+            "TRadiobutton": {
+                "configure": {"background": colors["bg"], "foreground": colors["fg"]},
+                "map": {"background": [('active', colors["bg"])]}
+            },
+            "Treeview": {
+                "configure": {"background": colors["tree_bg"], "foreground": colors["tree_fg"],
+                              "fieldbackground": colors["tree_bg"]},
+                "map": {"background": [('selected', '#0078D7')], "foreground": [('selected', 'white')]}
+            },
+            "Treeview.Heading": {
+                "configure": {"background": colors["tree_heading_bg"], "foreground": colors["fg"],
+                              "relief": "flat"},
+                "map": {"background": [('active', colors["tree_heading_bg"])]}
+            },
+        }
 
-        self.style.configure("TLabel", background=colors["bg"], foreground=colors["fg"])
-        self.style.configure("TButton", background=colors["btn_bg"], foreground=colors["fg"], borderwidth=1)
-        self.style.map("TButton", background=[('active', colors["btn_bg"])])
-        self.style.configure("TEntry", fieldbackground=colors["entry_bg"], foreground=colors["fg"],
-                             insertcolor=colors["fg"])
-        self.style.configure("TRadiobutton", background=colors["bg"], foreground=colors["fg"])
+    def _current_colors(self):
+        return self.dark_colors if self.current_theme == "dark" else self.light_colors
 
-        self.style.configure("Treeview",
-                             background=colors["tree_bg"],
-                             foreground=colors["tree_fg"],
-                             fieldbackground=colors["tree_bg"])
-        self.style.map("Treeview", background=[('selected', '#0078D7')], foreground=[('selected', 'white')])
+    def _register_themed_window(self, window):
+        self._themed_windows.append(window)
+        window.configure(bg=self._current_colors()["bg"])
 
-        self.style.configure("Treeview.Heading",
-                             background=colors["tree_heading_bg"],
-                             foreground=colors["fg"],
-                             relief="flat")
-        self.style.map("Treeview.Heading", background=[('active', colors["tree_heading_bg"])])
+    def apply_theme(self):
+        colors = self._current_colors()
+        self.style.theme_use(self._theme_names[self.current_theme])
 
-        for widget in self.root.winfo_children():
-            self._apply_theme_to_widget_recursive(widget, colors)
+        self._themed_windows = [w for w in self._themed_windows if w.winfo_exists()]
+        for window in self._themed_windows:
+            window.configure(bg=colors["bg"])
 
         if self.graph_win is not None and self.graph_win.winfo_exists():
-            self.show_graph(update_canvas=True)
-
-    def _apply_theme_to_widget_recursive(self, widget, colors):
-        widget_type = widget.winfo_class()
-        try:
-            if widget_type in ["Frame", "Labelframe", "TFrame", "TLabelFrame"]:
-                widget.configure(background=colors["bg"])
-            elif widget_type in ["Label", "Radiobutton", "Button"]:
-                widget.configure(background=colors["bg"], foreground=colors["fg"])
-            elif widget_type == "Entry":
-                widget.configure(background=colors["entry_bg"], foreground=colors["fg"], insertbackground=colors["fg"])
-        except tk.TclError:
-            pass
-
-        for child in widget.winfo_children():
-            self._apply_theme_to_widget_recursive(child, colors)
+            self._apply_graph_theme(colors)
 
     def toggle_theme(self):
         self.current_theme = "dark" if self.current_theme == "light" else "light"
@@ -175,7 +204,7 @@ class FinanceApp:
                 raise ValueError("Сума, категорія та дата є обов'язковими полями.")
 
             try:
-                amount_val = float(vals["Сума"].replace(',', '.'))
+                amount_minor = to_minor(vals["Сума"])
             except ValueError:
                 raise ValueError("Сума має бути числом.")
 
@@ -184,7 +213,7 @@ class FinanceApp:
             except ValueError:
                 raise ValueError("Неправильний формат дати. Використовуйте РРРР-ММ-ДД.")
 
-            self.manager.add_transaction(amount_val, vals["Категорія"], self.type_var.get(), vals["Опис"], vals["Дата"])
+            self.manager.add_transaction(amount_minor, vals["Категорія"], self.type_var.get(), vals["Опис"], vals["Дата"])
             messagebox.showinfo("Успіх", "Транзакція успішно додана!", parent=self.root)
             self.update_transactions_list()
             for key in ["Сума", "Категорія", "Опис"]: self.entries[key].delete(0, tk.END)
@@ -196,14 +225,69 @@ class FinanceApp:
 
     def show_balance(self):
         balance = self.manager.get_balance()
-        messagebox.showinfo("Баланс", f"Поточний баланс: {balance:.2f} грн", parent=self.root)
+        messagebox.showinfo("Баланс", f"Поточний баланс: {format_minor(balance)} грн", parent=self.root)
 
     def update_transactions_list(self, trans_list=None):
         self.tree.delete(*self.tree.get_children())
+        self._filtered_view = trans_list is not None
         transactions_to_show = trans_list if trans_list is not None else self.manager.get_transactions()
         for t in transactions_to_show:
-            self.tree.insert("", "end", iid=t["id"],
-                             values=(f"{t['amount']:.2f}", t["category"], t["type"], t["description"], t["date"]))
+            self.tree.insert("", "end", iid=t["id"], values=self._tree_values(t))
+        if trans_list is None:
+            self._schedule_graph_refresh()
+
+    def _tree_values(self, t):
+        return format_minor(t["amount_minor"]), t["category"], t["type"], t["description"], t["date"]
+
+    def _poll_external_changes(self):
+        try:
+            changes = self.manager.refresh()
+            if changes is None:
+                if not self._filtered_view:
+                    self.update_transactions_list()
+            elif changes:
+                self._apply_changes_to_tree(changes)
+                self._schedule_graph_refresh()
+        finally:
+            self.root.after(REFRESH_INTERVAL_MS, self._poll_external_changes)
+
+    def _poll_import_watcher(self):
+        try:
+            results = self.import_watcher.poll()
+            for result in results:
+                if result["status"] == "ok":
+                    print(f"Автоімпорт {result['file']}: {result['message']}")
+                else:
+                    messagebox.showwarning("Автоімпорт", f"{result['file']}: {result['message']}", parent=self.root)
+            if any(result["imported"] for result in results) and not self._filtered_view:
+                self.update_transactions_list()
+        finally:
+            self.root.after(WATCH_INTERVAL_MS, self._poll_import_watcher)
+
+    def _apply_changes_to_tree(self, changes):
+        for op in changes:
+            kind = op["op"]
+            if kind == "add":
+                t = op["transaction"]
+                if not self._filtered_view and not self.tree.exists(t["id"]):
+                    self.tree.insert("", self._tree_insert_index(t["date"]), iid=t["id"], values=self._tree_values(t))
+            elif kind == "delete":
+                if self.tree.exists(op["id"]):
+                    self.tree.delete(op["id"])
+            elif kind == "clear":
+                self.tree.delete(*self.tree.get_children())
+
+    def _tree_insert_index(self, date_str):
+        # Rows are ordered newest first; binary search keeps the number of Tcl round-trips logarithmic.
+        children = self.tree.get_children()
+        lo, hi = 0, len(children)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.tree.set(children[mid], "Date") >= date_str:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
 
     def delete_selected_transaction(self):
         selected_items = self.tree.selection()
@@ -235,8 +319,7 @@ class FinanceApp:
         dialog.grab_set()
         dialog.resizable(False, False)
 
-        colors = self.dark_colors if self.current_theme == "dark" else self.light_colors
-        dialog.configure(bg=colors["bg"])
+        self._register_themed_window(dialog)
 
         entries = {}
         frame = ttk.Frame(dialog, padding="10 10 10 10")
@@ -333,7 +416,7 @@ class FinanceApp:
             if not amount_str:
                 raise ValueError("Сума бюджету не може бути порожньою.")
             try:
-                budget_amount = float(amount_str.replace(',', '.'))
+                budget_amount = to_minor(amount_str)
                 if budget_amount < 0:
                     raise ValueError("Сума бюджету не може бути від'ємною.")
             except ValueError:
@@ -341,7 +424,7 @@ class FinanceApp:
 
             self.manager.budget[category] = budget_amount
             messagebox.showinfo("Бюджет встановлено",
-                                f"Бюджет для категорії '{category}' встановлено на {budget_amount:.2f} грн.",
+                                f"Бюджет для категорії '{category}' встановлено на {format_minor(budget_amount)} грн.",
                                 parent=self.root)
 
         fields = [
@@ -351,10 +434,7 @@ class FinanceApp:
         self._create_dialog_toplevel("Встановити/Оновити бюджет", fields, "Встановити", apply_budget)
 
     def show_category_report(self):
-        expenses_by_category = defaultdict(float)
-        for t in self.manager.get_transactions():
-            if t["type"] == "Витрата":
-                expenses_by_category[t["category"]] += t["amount"]
+        expenses_by_category = self.manager.get_category_totals("Витрата")
 
         report_lines = []
         all_categories = sorted(list(set(list(self.manager.budget.keys()) + list(expenses_by_category.keys()))))
@@ -364,29 +444,31 @@ class FinanceApp:
         total_budget_overall = sum(self.manager.budget.values())
 
         for cat in all_categories:
-            budget = self.manager.budget.get(cat, 0.0)
-            spent = expenses_by_category.get(cat, 0.0)
+            budget = self.manager.budget.get(cat, 0)
+            spent = expenses_by_category.get(cat, 0)
             total_actual_expenses += spent
 
             if cat in self.manager.budget:
                 remaining = budget - spent
                 status = "в межах" if remaining >= 0 else "перевищено на"
-                if remaining < 0: status += f" {abs(remaining):.2f}"
+                if remaining < 0: status += f" {format_minor(abs(remaining))}"
                 report_lines.append(
-                    f"- {cat}: Бюджет {budget:.2f}, Витрачено {spent:.2f} (Залишок: {remaining:.2f} - {status})")
+                    f"- {cat}: Бюджет {format_minor(budget)}, Витрачено {format_minor(spent)} "
+                    f"(Залишок: {format_minor(remaining)} - {status})")
                 total_budgeted_expenses += spent
             else:
-                report_lines.append(f"- {cat} (поза бюджетом): Витрачено {spent:.2f}")
+                report_lines.append(f"- {cat} (поза бюджетом): Витрачено {format_minor(spent)}")
 
         report_lines.append("\n--- Загалом ---")
-        report_lines.append(f"Загальний бюджет: {total_budget_overall:.2f}")
-        report_lines.append(f"Загальні витрати (за категоріями з бюджетом): {total_budgeted_expenses:.2f}")
-        report_lines.append(f"Загальні витрати (всі категорії): {total_actual_expenses:.2f}")
+        report_lines.append(f"Загальний бюджет: {format_minor(total_budget_overall)}")
+        report_lines.append(f"Загальні витрати (за категоріями з бюджетом): {format_minor(total_budgeted_expenses)}")
+        report_lines.append(f"Загальні витрати (всі категорії): {format_minor(total_actual_expenses)}")
 
         if total_budget_overall > 0:
             remaining_overall = total_budget_overall - total_budgeted_expenses
             status_overall = "в межах загального бюджету" if remaining_overall >= 0 else "перевищення загального бюджету"
-            report_lines.append(f"Залишок від загального бюджету: {remaining_overall:.2f} ({status_overall})")
+            report_lines.append(
+                f"Залишок від загального бюджету: {format_minor(remaining_overall)} ({status_overall})")
 
         if not report_lines:
             report_text = "Немає даних для звіту. Додайте транзакції та/або встановіть бюджети."
@@ -418,95 +500,152 @@ class FinanceApp:
             parent=self.root
         )
         if filename:
-            imported_count, message = self.manager.import_from_csv(filename)
-            if imported_count > 0 or "Імпорт завершено" in message:
+            success, imported_count, message = self.manager.import_from_csv(filename)
+            if success:
                 messagebox.showinfo("Результат імпорту", message, parent=self.root)
                 self.update_transactions_list()
             else:
                 messagebox.showerror("Помилка імпорту", message, parent=self.root)
 
     def show_graph(self, update_canvas=False):
-        transactions = self.manager.get_transactions(sort=False)
-        if not transactions:
-            if not update_canvas:
-                messagebox.showinfo("Графік", "Немає транзакцій для відображення на графіку.", parent=self.root)
+        graph_open = self.graph_win is not None and self.graph_win.winfo_exists()
+        if update_canvas and not graph_open:
             return
 
-        income_by_date = defaultdict(float)
-        expenses_by_date = defaultdict(float)
-        all_dates_dt = set()
-
-        for t in transactions:
-            try:
-                date_obj = datetime.strptime(t['date'], '%Y-%m-%d')
-                all_dates_dt.add(date_obj)
-                if t['type'] == 'Доход':
-                    income_by_date[date_obj] += t['amount']
-                else:
-                    expenses_by_date[date_obj] += t['amount']
-            except ValueError:
-                print(f"Пропуск транзакції з невірним форматом дати: {t}")
-                continue
-
-        if not all_dates_dt:
-            if not update_canvas:
-                messagebox.showinfo("Графік", "Немає коректних даних для графіка.", parent=self.root)
+        dates, income_values, expense_values = self.manager.get_daily_totals()
+        if not dates and not graph_open:
+            messagebox.showinfo("Графік", "Немає транзакцій для відображення на графіку.", parent=self.root)
             return
 
-        sorted_dates = sorted(list(all_dates_dt))
-        income_values = [income_by_date.get(d, 0.0) for d in sorted_dates]
-        expense_values = [expenses_by_date.get(d, 0.0) for d in sorted_dates]
-
-        graph_style = 'dark_background' if self.current_theme == 'dark' else 'seaborn-v0_8-whitegrid'
-        plt.style.use(graph_style)
-
-        if not update_canvas or self.graph_win is None or not self.graph_win.winfo_exists():
-            if hasattr(self, 'graph_win') and self.graph_win and self.graph_win.winfo_exists():
-                self._close_graph_window()
-
-            self.graph_win = tk.Toplevel(self.root)
-            self.graph_win.title("Графік доходів та витрат")
-            self.graph_win.transient(self.root)
-            self.graph_win.geometry("800x600")
-            self.graph_win.protocol("WM_DELETE_WINDOW", self._close_graph_window)
-
-            self.fig, self.ax = plt.subplots()
-
-            self.fig_canvas = FigureCanvasTkAgg(self.fig, master=self.graph_win)
-            self.fig_canvas_widget = self.fig_canvas.get_tk_widget()
-            self.fig_canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-            close_button = ttk.Button(self.graph_win, text="Закрити графік", command=self._close_graph_window)
-            close_button.pack(pady=5)
-        else:
-            self.ax.clear()
-
-        if self.current_theme == 'dark':
-            self.ax.set_facecolor('#2E2E2E')
-            self.fig.patch.set_facecolor('#2E2E2E')
-            self.ax.tick_params(axis='x', colors='white')
-            self.ax.tick_params(axis='y', colors='white')
-            self.ax.xaxis.label.set_color('white')
-            self.ax.yaxis.label.set_color('white')
-            self.ax.title.set_color('white')
-            legend = self.ax.legend(facecolor='#3E3E3E', edgecolor='white', labelcolor='white')
-            if legend:
-                for text in legend.get_texts():
-                    text.set_color('white')
-        else:
-            pass
-
-        self.ax.plot(sorted_dates, income_values, label='Доходи', color='green', marker='o', linestyle='-')
-        self.ax.plot(sorted_dates, expense_values, label='Витрати', color='red', marker='x', linestyle='--')
-
+        if not graph_open:
+            self._create_graph_window()
+        elif not update_canvas:
+            self.graph_win.lift()
+
+        self._update_graph_data(dates, income_values, expense_values)
+
+    def _balance_series(self, dates, income_values, expense_values):
+        today = datetime.now().date()
+        history_dates, history_balances = [], []
+        balance = 0
+        for day, income, expense in zip(dates, income_values, expense_values):
+            if day > today:
+                break
+            balance += income - expense
+            history_dates.append(day)
+            history_balances.append(minor_to_float(balance))
+        forecast_dates, forecast_balances = self.forecast_engine.forecast()
+        return history_dates, history_balances, forecast_dates, [minor_to_float(v) for v in forecast_balances]
+
+    def _create_graph_window(self):
+        self.graph_win = tk.Toplevel(self.root)
+        self._register_themed_window(self.graph_win)
+        self.graph_win.title("Графік доходів, витрат та прогнозу балансу")
+        self.graph_win.transient(self.root)
+        self.graph_win.geometry("800x600")
+        self.graph_win.protocol("WM_DELETE_WINDOW", self._close_graph_window)
+
+        self.fig, self.ax = plt.subplots()
+
+        self.fig_canvas = FigureCanvasTkAgg(self.fig, master=self.graph_win)
+        self.fig_canvas_widget = self.fig_canvas.get_tk_widget()
+        self.fig_canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        close_button = ttk.Button(self.graph_win, text="Закрити графік", command=self._close_graph_window)
+        close_button.pack(pady=5)
+
+        # The data lines are animated: a full draw renders only the static axes, which are cached
+        # as the blit background, and data updates redraw just the lines on top of it.
+        self._income_line, = self.ax.plot([], [], label='Доходи', color='green', marker='o', linestyle='-',
+                                          animated=True)
+        self._expense_line, = self.ax.plot([], [], label='Витрати', color='red', marker='x', linestyle='--',
+                                           animated=True)
+        self.ax_balance = self.ax.twinx()
+        self._balance_line, = self.ax_balance.plot([], [], label='Баланс', color='#1f77b4', linestyle='-',
+                                                   animated=True)
+        self._forecast_line, = self.ax_balance.plot([], [], label='Прогноз балансу', color='#1f77b4',
+                                                    linestyle=':', linewidth=2, animated=True)
         self.ax.set_xlabel('Дата')
         self.ax.set_ylabel('Сума (грн)')
+        self.ax_balance.set_ylabel('Баланс (грн)')
         self.ax.set_title('Динаміка доходів та витрат')
-        self.ax.legend()
-        self.ax.grid(True, linestyle=':', alpha=0.7)
-        self.fig.autofmt_xdate()
+        self.ax.legend(handles=[self._income_line, self._expense_line, self._balance_line, self._forecast_line],
+                       loc='upper left')
+        self.ax.tick_params(axis='x', labelrotation=30)
+        self.fig.subplots_adjust(bottom=0.18)
+        self._graph_background = None
+        self.fig_canvas.mpl_connect('draw_event', self._on_graph_draw)
+
+        self._apply_graph_theme(self._current_colors())
+
+    def _apply_graph_theme(self, colors):
+        self.fig.patch.set_facecolor(colors["graph_bg"])
+        self.ax.set_facecolor(colors["graph_bg"])
+        self.ax.tick_params(colors=colors["graph_fg"])
+        for spine in self.ax.spines.values():
+            spine.set_color(colors["graph_fg"])
+        self.ax.xaxis.label.set_color(colors["graph_fg"])
+        self.ax.yaxis.label.set_color(colors["graph_fg"])
+        self.ax.title.set_color(colors["graph_fg"])
+        self.ax_balance.tick_params(colors=colors["graph_fg"])
+        self.ax_balance.yaxis.label.set_color(colors["graph_fg"])
+        for spine in self.ax_balance.spines.values():
+            spine.set_color(colors["graph_fg"])
+        self.ax.grid(True, linestyle=':', alpha=0.7, color=colors["graph_grid"])
+        legend = self.ax.get_legend()
+        if legend:
+            legend.get_frame().set_facecolor(colors["legend_bg"])
+            legend.get_frame().set_edgecolor(colors["graph_fg"])
+            for text in legend.get_texts():
+                text.set_color(colors["graph_fg"])
+        self.fig_canvas.draw_idle()
+
+    def _on_graph_draw(self, event):
+        self._graph_background = self.fig_canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_graph_lines()
+
+    def _graph_limits(self):
+        return self.ax.get_xlim(), self.ax.get_ylim(), self.ax_balance.get_xlim(), self.ax_balance.get_ylim()
+
+    def _draw_graph_lines(self):
+        self.ax.draw_artist(self._income_line)
+        self.ax.draw_artist(self._expense_line)
+        self.ax_balance.draw_artist(self._balance_line)
+        self.ax_balance.draw_artist(self._forecast_line)
+        self.fig_canvas.blit(self.fig.bbox)
+
+    def _update_graph_data(self, dates, income_values, expense_values):
+        # Per-point markers dominate rendering time on long histories.
+        show_markers = len(dates) <= 500
+        self._income_line.set_marker('o' if show_markers else '')
+        self._expense_line.set_marker('x' if show_markers else '')
+        self._income_line.set_data(dates, [minor_to_float(v) for v in income_values])
+        self._expense_line.set_data(dates, [minor_to_float(v) for v in expense_values])
+        history_dates, history_balances, forecast_dates, forecast_balances = self._balance_series(
+            dates, income_values, expense_values)
+        self._balance_line.set_data(history_dates, history_balances)
+        self._forecast_line.set_data(forecast_dates, forecast_balances)
+
+        old_limits = self._graph_limits()
+        for ax in (self.ax, self.ax_balance):
+            ax.relim()
+            ax.autoscale_view()
+        if self._graph_background is not None and old_limits == self._graph_limits():
+            self.fig_canvas.restore_region(self._graph_background)
+            self._draw_graph_lines()
+        else:
+            self.fig_canvas.draw_idle()
+
+    def _schedule_graph_refresh(self):
+        if self.graph_win is None or self._graph_refresh_pending:
+            return
+        self._graph_refresh_pending = True
+
+        def refresh():
+            self._graph_refresh_pending = False
+            self.show_graph(update_canvas=True)
 
-        self.fig_canvas.draw()
+        self.root.after_idle(refresh)
 
     def _close_graph_window(self):
         if self.fig_canvas_widget and self.fig_canvas_widget.winfo_exists():
@@ -521,6 +660,12 @@ class FinanceApp:
         self.fig_canvas_widget = None
         self.fig = None
         self.ax = None
+        self.ax_balance = None
+        self._income_line = None
+        self._expense_line = None
+        self._balance_line = None
+        self._forecast_line = None
+        self._graph_background = None
 
     def add_recurring_payment_dialog(self):
         def on_submit_recurring(values):
@@ -535,8 +680,8 @@ class FinanceApp:
                 raise ValueError("Всі поля є обов'язковими для заповнення.")
 
             try:
-                amount_val = float(amount_str.replace(',', '.'))
-                if amount_val <= 0: raise ValueError("Сума має бути позитивним числом.")
+                amount_minor = to_minor(amount_str)
+                if amount_minor <= 0: raise ValueError("Сума має бути позитивним числом.")
             except ValueError:
                 raise ValueError("Сума має бути коректним числом.")
 
@@ -555,7 +700,7 @@ class FinanceApp:
 
             payment_details = {
                 "description": desc,
-                "amount": amount_val,
+                "amount_minor": amount_minor,
                 "category": cat,
                 "type": type_trans,
                 "start_date": start_date_str,
@@ -563,7 +708,7 @@ class FinanceApp:
             }
             self.manager.add_recurring_payment(payment_details)
             messagebox.showinfo("Успіх", "Регулярний платіж успішно додано.", parent=self.root)
-            self.manager._process_recurring_payments()
+            self.manager.process_recurring_payments()
             self.update_transactions_list()
 
         fields = [
@@ -0,0 +1,171 @@
+# cli.py
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from config import (DATA_FILE, RECURRING_PAYMENTS_FILE, WATCH_DIR, WATCH_INTERVAL_MS, IMPORT_WORKERS,
+                    FORECAST_MONTHS)
+from data_manager import FinanceManager
+from forecast import ForecastEngine
+from money import format_minor
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Неправильний формат дати '{value}'. Використовуйте РРРР-ММ-ДД.")
+
+
+def _parse_months(value):
+    try:
+        months = int(value)
+    except ValueError:
+        months = 0
+    if not 1 <= months <= 120:
+        raise argparse.ArgumentTypeError(f"Кількість місяців має бути цілим числом від 1 до 120, отримано '{value}'.")
+    return months
+
+
+def cmd_import(manager, args):
+    failed = False
+    for filename in args.files:
+        if filename == "-":
+            success, imported_count, message = manager.import_from_stream(sys.stdin)
+        else:
+            success, imported_count, message = manager.import_from_csv(filename)
+        print(f"{filename}: {message}", file=sys.stderr)
+        if not success:
+            failed = True
+    return 1 if failed else 0
+
+
+def cmd_export(manager, args):
+    if args.file == "-":
+        manager.write_csv(sys.stdout)
+        return 0
+    success, message = manager.export_to_csv(args.file)
+    print(message, file=sys.stderr)
+    return 0 if success else 1
+
+
+def cmd_balance(manager, args):
+    print(format_minor(manager.get_balance()))
+    return 0
+
+
+def cmd_report(manager, args):
+    if (args.start is None) != (args.end is None):
+        print("Для звіту за період потрібні обидві дати: --from та --to.", file=sys.stderr)
+        return 2
+    totals = manager.get_category_totals(args.type, args.start, args.end)
+    write = sys.stdout.write
+    for cat, amount in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+        write(f"{cat}\t{format_minor(amount)}\n")
+    return 0
+
+
+def cmd_forecast(manager, args):
+    dates, balances = ForecastEngine(manager).forecast(args.months)
+    write = sys.stdout.write
+    for day, balance in zip(dates, balances):
+        write(f"{day.isoformat()}\t{format_minor(balance)}\n")
+    return 0
+
+
+def cmd_process_recurring(manager, args):
+    posted = manager.process_recurring_payments()
+    print(f"Проведено регулярних платежів: {posted}", file=sys.stderr)
+    return 0
+
+
+def cmd_compact(manager, args):
+    success, removed = manager.compact()
+    if not success:
+        print("Не вдалося переписати файл даних; журнал збережено без змін.", file=sys.stderr)
+        return 1
+    print(f"Стиснення завершено. Видалено дублікатів: {removed}", file=sys.stderr)
+    return 0
+
+
+def cmd_watch(manager, args):
+    if not args.dir:
+        print("Не вказано каталог для спостереження (--dir або WATCH_DIR у config.py).", file=sys.stderr)
+        return 2
+    # Imported here so the other commands do not pay for the thread pool machinery at startup.
+    from import_watcher import ImportWatcher
+
+    watcher = ImportWatcher(manager, args.dir, workers=args.workers)
+    failed = False
+    try:
+        while True:
+            for result in watcher.poll(require_stable=not args.once):
+                print(f"{result['file']}: {result['message']}", file=sys.stderr)
+                failed = failed or result["status"] != "ok"
+            if args.once and not watcher.pending():
+                break
+            time.sleep(0.05 if args.once else args.interval / 1000)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.shutdown()
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Облік фінансів без графічного інтерфейсу.")
+    parser.add_argument("--data", default=DATA_FILE, help="файл транзакцій")
+    parser.add_argument("--recurring", default=RECURRING_PAYMENTS_FILE, help="файл регулярних платежів")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("import", help="імпорт транзакцій з CSV ('-' для stdin)")
+    p.add_argument("files", nargs="+")
+    p.set_defaults(func=cmd_import)
+
+    p = subparsers.add_parser("export", help="експорт транзакцій у CSV (за замовчуванням у stdout)")
+    p.add_argument("file", nargs="?", default="-")
+    p.set_defaults(func=cmd_export)
+
+    p = subparsers.add_parser("balance", help="поточний баланс")
+    p.set_defaults(func=cmd_balance)
+
+    p = subparsers.add_parser("report", help="суми за категоріями")
+    p.add_argument("--type", default="Витрата", choices=["Доход", "Витрата"])
+    p.add_argument("--from", dest="start", type=_parse_date)
+    p.add_argument("--to", dest="end", type=_parse_date)
+    p.set_defaults(func=cmd_report)
+
+    p = subparsers.add_parser("forecast", help="прогноз балансу за регулярними платежами")
+    p.add_argument("--months", type=_parse_months, default=FORECAST_MONTHS)
+    p.set_defaults(func=cmd_forecast)
+
+    p = subparsers.add_parser("process-recurring", help="провести регулярні платежі, строк яких настав")
+    p.set_defaults(func=cmd_process_recurring)
+
+    p = subparsers.add_parser("compact", help="видалити дублікати та переписати файл даних")
+    p.set_defaults(func=cmd_compact)
+
+    p = subparsers.add_parser("watch", help="імпортувати нові CSV-виписки з каталогу")
+    p.add_argument("--dir", default=WATCH_DIR)
+    p.add_argument("--interval", type=int, default=WATCH_INTERVAL_MS, help="інтервал опитування, мс")
+    p.add_argument("--workers", type=int, default=IMPORT_WORKERS)
+    p.add_argument("--once", action="store_true", help="обробити наявні файли та завершити роботу")
+    p.set_defaults(func=cmd_watch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    manager = FinanceManager(args.data, args.recurring, process_recurring=False)
+    try:
+        return args.func(manager, args)
+    except BrokenPipeError:
+        sys.stderr.close()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,15 @@
 DATA_FILE = "finance_data.json"
 RECURRING_PAYMENTS_FILE = "recurring_payments.json"
-APP_PASSWORD = "password123"
\ No newline at end of file
+APP_PASSWORD = "password123"
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+JOURNAL_COMPACT_MIN_BYTES = 1024 * 1024
+REFRESH_INTERVAL_MS = 2000
+WATCH_DIR = ""
+WATCH_INTERVAL_MS = 5000
+IMPORT_WORKERS = 4
+IMPORT_BATCH_SIZE = 1000
+IMPORT_LEDGER_FILE = "processed_imports.json"
+FORECAST_MONTHS = 6
\ No newline at end of file
@@ -1,20 +1,204 @@
 import json
 import os
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime, date, timedelta
 import csv
 import uuid
 from collections import defaultdict
 import calendar
+from bisect import bisect_left, bisect_right
 
-from config import DATA_FILE, RECURRING_PAYMENTS_FILE
+from config import DATA_FILE, RECURRING_PAYMENTS_FILE, JOURNAL_COMPACT_MIN_BYTES, IMPORT_BATCH_SIZE
+from file_lock import FileLock
+from money import to_minor, format_minor
+
+# Each insert into the date-sorted view is O(n); past this many rows in one go a single re-sort
+# on the next query is cheaper, so bulk paths drop the view instead of maintaining it.
+SORTED_VIEW_INSERT_LIMIT = 256
+
+
+def _file_signature(filename):
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _normalize_amount(item):
+    # Files written before amounts moved to integer kopiyky store a float "amount" instead.
+    if "amount_minor" not in item:
+        item["amount_minor"] = to_minor(item.pop("amount", 0))
+    return item
+
+
+def _shift_month(month, delta):
+    year, mon = int(month[:4]), int(month[5:7]) - 1 + delta
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+
+
+def _current_month():
+    return datetime.now().strftime('%Y-%m')
+
+
+def calculate_next_due_date(last_due_date: datetime, frequency: str):
+    if frequency == "Щомісячно":
+        month = last_due_date.month
+        year = last_due_date.year
+        day = last_due_date.day
+
+        if month == 12:
+            month = 1
+            year += 1
+        else:
+            month += 1
+
+        max_day_in_next_month = calendar.monthrange(year, month)[1]
+        day = min(day, max_day_in_next_month)
+        return datetime(year, month, day)
+
+    elif frequency == "Щотижнево":
+        return last_due_date + timedelta(weeks=1)
+    return None
+
+
+def _rollup_add(rollups, t, sign=1):
+    month = t["date"][:7]
+    rollup = rollups.get(month)
+    if rollup is None:
+        rollup = rollups[month] = {"count": 0, "totals": {}, "categories": {}}
+    rollup["count"] += sign
+    if not rollup["count"]:
+        del rollups[month]
+        return
+    amount = t["amount_minor"] * sign
+    totals = rollup["totals"]
+    totals[t["type"]] = totals.get(t["type"], 0) + amount
+    categories = rollup["categories"].setdefault(t["type"], {})
+    categories[t["category"]] = categories.get(t["category"], 0) + amount
+    if not categories[t["category"]]:
+        del categories[t["category"]]
+
+
+def _summary_add(summary, rollup):
+    summary["count"] += rollup["count"]
+    for type_trans, amount in rollup["totals"].items():
+        summary["totals"][type_trans] = summary["totals"].get(type_trans, 0) + amount
+    for type_trans, categories in rollup["categories"].items():
+        target = summary["categories"].setdefault(type_trans, {})
+        for cat, amount in categories.items():
+            target[cat] = target.get(cat, 0) + amount
+
+
+# The header is checked immediately (ValueError); rows are then parsed lazily as the caller iterates,
+# with per-row problems appended to `errors`, so a large stream is never held in memory at once.
+def parse_csv_rows(f, errors):
+    reader = csv.reader(f, delimiter=';')
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("Файл порожній.")
+    header_map = {h.strip().lstrip('\ufeff'): i for i, h in enumerate(header)}
+
+    required_headers = ["Amount", "Category", "Type", "Date"]
+    if not all(h in header_map for h in required_headers):
+        missing = [h for h in required_headers if h not in header_map]
+        raise ValueError(f"Необхідні колонки відсутні: {', '.join(missing)}")
+    return _iter_csv_rows(reader, header_map, errors)
+
+
+def _iter_csv_rows(reader, header_map, errors):
+    for row_num, row in enumerate(reader, start=2):
+        if len(row) <= max(header_map.values()):
+            errors.append(f"Рядок {row_num}: Недостатньо колонок.")
+            continue
+        try:
+            amount_str = row[header_map["Amount"]].strip()
+            category = row[header_map["Category"]].strip()
+            type_ = row[header_map["Type"]].strip()
+            date_str = row[header_map["Date"]].strip()
+            description = row[
+                header_map.get("Description", len(row))].strip() if "Description" in header_map and \
+                                                                    header_map["Description"] < len(
+                row) else ""
+
+            if not amount_str or not category or not type_ or not date_str:
+                errors.append(f"Рядок {row_num}: Пропущені обов'язкові поля.")
+                continue
+
+            trans_id = None
+            if "Transaction ID" in header_map and header_map["Transaction ID"] < len(row):
+                id_val = row[header_map["Transaction ID"]].strip()
+                if id_val:
+                    trans_id = id_val
+
+            amount_minor = to_minor(amount_str)
+            date_str = datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m-%d')
+        except (ValueError, IndexError) as e:
+            errors.append(f"Рядок {row_num}: Помилка даних або формату - {e}.")
+            continue
+        except Exception as e:
+            errors.append(f"Рядок {row_num}: Неочікувана помилка - {e}.")
+            continue
+        yield {"amount_minor": amount_minor, "cat": category, "type_trans": type_,
+               "desc": description, "date_str": date_str, "trans_id": trans_id}
+
+
+# Rows without an explicit ID get one derived from their content, so a row repeated in a later,
+# overlapping statement or a retried import is recognised as already imported. The running count
+# keeps identical rows within one file apart.
+def with_content_ids(rows):
+    occurrences = {}
+    for row in rows:
+        if not row["trans_id"]:
+            key = "|".join(str(row[k]) for k in ("date_str", "amount_minor", "type_trans", "cat", "desc"))
+            occurrences[key] = occurrences.get(key, 0) + 1
+            row["trans_id"] = uuid.uuid5(uuid.NAMESPACE_OID, f"{key}|{occurrences[key]}").hex
+        yield row
+
+
+def import_status_message(imported_count, duplicate_count, errors):
+    status_message = f"Імпорт завершено. Додано {imported_count} транзакцій."
+    if duplicate_count:
+        status_message += f" Пропущено вже наявних: {duplicate_count}."
+    if errors:
+        status_message += "\nВиявлені помилки:\n" + "\n".join(errors[:5])
+        if len(errors) > 5:
+            status_message += f"\n... та ще {len(errors) - 5} помилок (див. консоль/логи)."
+            print("Детальні помилки імпорту:", "\n".join(errors), file=sys.stderr)
+    return status_message
 
 
 class FinanceManager:
-    def __init__(self):
-        self.transactions = self._load_data_from_file(DATA_FILE)
+    def __init__(self, data_file=DATA_FILE, recurring_file=RECURRING_PAYMENTS_FILE, process_recurring=True,
+                 track_changes=False):
+        self.data_file = data_file
+        self.journal_file = data_file + ".journal"
+        self.rollups_file = data_file + ".rollups"
+        self.recurring_file = recurring_file
+        self._data_lock = FileLock(data_file)
+        self._recurring_lock = FileLock(recurring_file)
+
+        self.transactions = []
+        self._ids = set()
+        self._sorted_cache = None
+        self._sorted_dates = None
+        self._base_signature = None
+        self._journal_offset = 0
+        self._unsaved_ops = []
+        # Only a consumer that drains refresh() regularly (the GUI) asks for other processes' ops to be kept.
+        self.track_changes = track_changes
+        self._pending_changes = []
+        self._needs_full_refresh = False
+        self._rollups = None
+        self._open_month = _current_month()
+        with self._data_lock:
+            self._load_transactions()
+
         self.budget = {}
-        self.recurring_payments = self._load_data_from_file(RECURRING_PAYMENTS_FILE, is_recurring=True)
-        self._process_recurring_payments()
+        self.recurring_payments = self._load_data_from_file(self.recurring_file, is_recurring=True)
+        self._recurring_signature = _file_signature(self.recurring_file)
+        if process_recurring:
+            self.process_recurring_payments()
 
     def _load_data_from_file(self, filename, is_recurring=False):
         if not os.path.exists(filename):
@@ -24,18 +208,20 @@ class FinanceManager:
                 data = json.load(f)
                 if is_recurring:
                     for item in data:
+                        _normalize_amount(item)
                         if isinstance(item.get('start_date'), str):
                             item['start_date'] = datetime.strptime(item['start_date'], '%Y-%m-%d')
                         if isinstance(item.get('next_due_date'), str):
                             item['next_due_date'] = datetime.strptime(item['next_due_date'], '%Y-%m-%d')
                 return data
         except (json.JSONDecodeError, IOError):
-            print(f"Warning: Could not load or parse {filename}. Starting with empty data.")
+            print(f"Warning: Could not load or parse {filename}. Starting with empty data.", file=sys.stderr)
             return []
 
     def _save_data_to_file(self, data, filename, is_recurring=False):
+        tmp_filename = filename + ".tmp"
         try:
-            with open(filename, "w", encoding='utf-8') as f:
+            with open(tmp_filename, "w", encoding='utf-8') as f:
                 if is_recurring:
                     data_to_save = []
                     for item in data:
@@ -48,152 +234,486 @@ class FinanceManager:
                     json.dump(data_to_save, f, indent=2, ensure_ascii=False)
                 else:
                     json.dump(data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_filename, filename)
         except IOError as e:
-            print(f"Error saving {filename}: {e}")
+            print(f"Error saving {filename}: {e}", file=sys.stderr)
+            return False
+        return True
+
+    # Transactions live in the base JSON file plus an append-only journal of operations
+    # ("add"/"delete"/"clear") that is folded back into the base by compact(). Writers append
+    # under the shared file lock; every instance remembers how far into the journal it has
+    # read, so picking up another process's changes only parses the new lines.
+    def _load_transactions(self):
+        self._rollups = None
+        self._base_signature = _file_signature(self.data_file)
+        self.transactions = [_normalize_amount(t) for t in self._load_data_from_file(self.data_file)]
+        self._ids = {t["id"] for t in self.transactions}
+        self._journal_offset = 0
+        self._invalidate_caches()
+
+        stored = self._load_stored_rollups()
+        if stored is not None:
+            # The stored rollups reflect the journal up to a known offset: replay that part
+            # untracked, then let the remaining tail update them incrementally.
+            self._read_journal(limit=stored["journal_offset"])
+            if self._journal_offset == stored["journal_offset"]:
+                self._rollups = stored["months"]
+                self._open_month = stored["open_month"]
+                if self._read_journal() or self._close_elapsed_months():
+                    self._save_rollups()
+                return
+        self._read_journal()
+        self._rebuild_rollups()
+        self._save_rollups()
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.journal_file)
+        except OSError:
+            return 0
 
-    def add_transaction(self, amount, cat, type_trans, desc, date_str, trans_id=None):
-        datetime.strptime(date_str, '%Y-%m-%d')
-        self.transactions.append({
+    def _read_journal(self, limit=None):
+        try:
+            with open(self.journal_file, "rb") as f:
+                f.seek(self._journal_offset)
+                chunk = f.read() if limit is None else f.read(max(0, limit - self._journal_offset))
+        except FileNotFoundError:
+            return []
+
+        # A line without its newline is still being written by another process.
+        end = chunk.rfind(b"\n") + 1
+        lines = chunk[:end].splitlines()
+        if len(lines) > SORTED_VIEW_INSERT_LIMIT:
+            self._invalidate_caches()
+        applied = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                op = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                print(f"Warning: Skipping corrupted line in {self.journal_file}.", file=sys.stderr)
+                continue
+            if self._apply_op(op):
+                applied.append(op)
+        self._journal_offset += end
+        return applied
+
+    def _apply_op(self, op):
+        kind = op.get("op")
+        if kind == "add":
+            transaction = _normalize_amount(op["transaction"])
+            if transaction["id"] in self._ids:
+                return False
+            self.transactions.append(transaction)
+            self._ids.add(transaction["id"])
+            self._track_added(transaction)
+        elif kind == "delete":
+            if op["id"] not in self._ids:
+                return False
+            removed = [t for t in self.transactions if t["id"] == op["id"]]
+            self.transactions = [t for t in self.transactions if t["id"] != op["id"]]
+            self._ids.discard(op["id"])
+            for t in removed:
+                self._track_removed(t)
+        elif kind == "clear":
+            if not self.transactions:
+                return False
+            self.transactions = []
+            self._ids = set()
+            self._sorted_cache = []
+            self._sorted_dates = []
+            if self._rollups is not None:
+                self._rollups = {}
+        else:
+            return False
+        return True
+
+    def _track_added(self, t):
+        if self._sorted_cache is not None:
+            # Equal dates keep insertion order in the newest-first view, matching a stable re-sort.
+            pos = bisect_left(self._sorted_dates, t["date"])
+            self._sorted_cache.insert(len(self._sorted_dates) - pos, t)
+            self._sorted_dates.insert(pos, t["date"])
+        if self._rollups is not None and t["date"][:7] < self._open_month:
+            _rollup_add(self._rollups, t)
+
+    def _track_removed(self, t):
+        if self._sorted_cache is not None:
+            count = len(self._sorted_dates)
+            lo = bisect_left(self._sorted_dates, t["date"])
+            hi = bisect_right(self._sorted_dates, t["date"])
+            for i in range(count - hi, count - lo):
+                if self._sorted_cache[i] is t:
+                    del self._sorted_cache[i]
+                    del self._sorted_dates[lo]
+                    break
+        if self._rollups is not None and t["date"][:7] < self._open_month:
+            _rollup_add(self._rollups, t, sign=-1)
+
+    # Closed (past) months are materialized as per-month rollups of counts, per-type totals and
+    # per-type category sums, persisted next to the data file together with the journal offset
+    # they reflect. Queries combine whole closed months from the rollups with a bisect-bounded
+    # scan of the partial months at the edges of the range and of the still-open months.
+    def _load_stored_rollups(self):
+        try:
+            with open(self.rollups_file, "r", encoding='utf-8') as f:
+                stored = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, IOError):
+            return None
+        if (not isinstance(stored, dict) or stored.get("version") != 2
+                or stored.get("base") != list(self._base_signature or [])):
+            return None
+        return stored
+
+    def _rebuild_rollups(self):
+        self._open_month = _current_month()
+        rollups = {}
+        for t in self.transactions:
+            if t["date"][:7] < self._open_month:
+                _rollup_add(rollups, t)
+        self._rollups = rollups
+
+    def _close_elapsed_months(self):
+        current = _current_month()
+        if current <= self._open_month:
+            return False
+        # "YYYY-MM-00" sorts after every date of the previous month and before any of this one.
+        for t in self._range_slice(self._open_month + "-01", current + "-00"):
+            _rollup_add(self._rollups, t)
+        self._open_month = current
+        return True
+
+    def _save_rollups(self):
+        if self._unsaved_ops:
+            return
+        self._save_data_to_file({
+            "version": 2,
+            "base": list(self._base_signature or []),
+            "journal_offset": self._journal_offset,
+            "open_month": self._open_month,
+            "months": self._rollups
+        }, self.rollups_file)
+
+    def _sync_locked(self):
+        if (_file_signature(self.data_file) != self._base_signature
+                or self._journal_size() < self._journal_offset):
+            self._load_transactions()
+            for op in self._unsaved_ops:
+                self._apply_op(op)
+            self._needs_full_refresh = True
+            self._pending_changes = []
+            return
+        applied = self._read_journal()
+        if self.track_changes:
+            self._pending_changes.extend(applied)
+
+    def _commit(self, ops):
+        with self._data_lock:
+            self._sync_locked()
+            # Re-applying is a no-op unless another process's changes were just merged underneath ours.
+            for op in ops:
+                self._apply_op(op)
+            data = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops).encode("utf-8")
+            try:
+                with open(self.journal_file, "ab") as f:
+                    f.write(data)
+                    self._journal_offset = f.tell()
+            except IOError as e:
+                print(f"Error saving {self.journal_file}: {e}", file=sys.stderr)
+                return
+            base_size = self._base_signature[2] if self._base_signature else 0
+            if self._journal_offset > max(JOURNAL_COMPACT_MIN_BYTES, base_size):
+                self._compact_locked()
+
+    def _flush_unsaved(self):
+        if self._unsaved_ops:
+            ops, self._unsaved_ops = self._unsaved_ops, []
+            self._commit(ops)
+
+    def _compact_locked(self):
+        # The journal is the only copy of recent changes until the new base file is in place.
+        if not self._save_data_to_file(self.transactions, self.data_file):
+            return False
+        self._unsaved_ops = []
+        self._base_signature = _file_signature(self.data_file)
+        try:
+            open(self.journal_file, "wb").close()
+        except IOError as e:
+            # Replaying the old journal over the new base is harmless: every op is idempotent.
+            print(f"Error saving {self.journal_file}: {e}", file=sys.stderr)
+            return False
+        self._journal_offset = 0
+        self._close_elapsed_months()
+        self._save_rollups()
+        return True
+
+    def has_external_changes(self):
+        return (_file_signature(self.data_file) != self._base_signature
+                or self._journal_size() != self._journal_offset)
+
+    def refresh(self):
+        if self.has_external_changes():
+            with self._data_lock:
+                self._sync_locked()
+        if self._needs_full_refresh:
+            self._needs_full_refresh = False
+            return None
+        changes, self._pending_changes = self._pending_changes, []
+        return changes
+
+    def add_transaction(self, amount_minor, cat, type_trans, desc, date_str, trans_id=None, save=True):
+        # Stored dates must be zero-padded: range lookups and monthly rollups compare them as strings.
+        date_str = datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m-%d')
+        transaction = {
             "id": trans_id or uuid.uuid4().hex,
-            "amount": float(amount),
+            "amount_minor": int(amount_minor),
             "category": cat,
             "type": type_trans,
             "description": desc,
             "date": date_str
-        })
-        self._save_data_to_file(self.transactions, DATA_FILE)
+        }
+        op = {"op": "add", "transaction": transaction}
+        if not self._apply_op(op):
+            return None
+        if save:
+            self._commit([op])
+        else:
+            self._unsaved_ops.append(op)
+        return transaction
 
     def get_balance(self):
-        inc = sum(t["amount"] for t in self.transactions if t["type"] == "Доход")
-        exp = sum(t["amount"] for t in self.transactions if t["type"] == "Витрата")
-        return inc - exp
+        totals = self.get_summary()["totals"]
+        return totals.get("Доход", 0) - totals.get("Витрата", 0)
+
+    def _invalidate_caches(self):
+        self._sorted_cache = None
+        self._sorted_dates = None
+
+    def _sorted_transactions(self):
+        if self._sorted_cache is None:
+            self._sorted_cache = sorted(self.transactions, key=lambda t: t["date"], reverse=True)
+            self._sorted_dates = [t["date"] for t in reversed(self._sorted_cache)]
+        return self._sorted_cache
 
     def get_transactions(self, sort=True):
         if sort:
-            return sorted(self.transactions, key=lambda t: t["date"], reverse=True)
+            return list(self._sorted_transactions())
         return self.transactions
 
+    def has_transaction(self, trans_id):
+        return trans_id in self._ids
+
     def delete_transaction_by_id(self, trans_id):
-        self.transactions = [t for t in self.transactions if t["id"] != trans_id]
-        self._save_data_to_file(self.transactions, DATA_FILE)
+        op = {"op": "delete", "id": trans_id}
+        if self._apply_op(op):
+            self._commit([op])
 
     def clear_transactions(self):
-        self.transactions = []
-        self._save_data_to_file(self.transactions, DATA_FILE)
+        op = {"op": "clear"}
+        self._apply_op(op)
+        self._commit([op])
+
+    def _range_bounds(self, start_str, end_str):
+        # Bounds of the date range as indices into the newest-first view.
+        self._sorted_transactions()
+        dates = self._sorted_dates
+        count = len(dates)
+        return count - bisect_right(dates, end_str), count - bisect_left(dates, start_str)
+
+    def _range_slice(self, start_str, end_str):
+        first, last = self._range_bounds(start_str, end_str)
+        return self._sorted_cache[first:last]
 
     def get_transactions_by_date(self, start_dt, end_dt):
-        return sorted(
-            [t for t in self.transactions if start_dt <= datetime.strptime(t['date'], '%Y-%m-%d') <= end_dt],
-            key=lambda t: t["date"],
-            reverse=True
-        )
+        return self._range_slice(start_dt.strftime('%Y-%m-%d'), end_dt.strftime('%Y-%m-%d'))
+
+    def get_transactions_page(self, offset, limit, start_dt=None, end_dt=None):
+        if start_dt is not None:
+            first, last = self._range_bounds(start_dt.strftime('%Y-%m-%d'), end_dt.strftime('%Y-%m-%d'))
+        else:
+            first, last = 0, len(self._sorted_transactions())
+        start = min(first + offset, last)
+        return last - first, self._sorted_cache[start:min(start + limit, last)]
+
+    def get_summary(self, start_dt=None, end_dt=None):
+        self._close_elapsed_months()
+        start_str = start_dt.strftime('%Y-%m-%d') if start_dt is not None else "0001-01-01"
+        end_str = end_dt.strftime('%Y-%m-%d') if end_dt is not None else "9999-12-31"
+
+        first_full = start_str[:7] if start_str[8:] == "01" else _shift_month(start_str[:7], 1)
+        end_year, end_month = int(end_str[:4]), int(end_str[5:7])
+        if int(end_str[8:]) >= calendar.monthrange(end_year, end_month)[1]:
+            last_full = end_str[:7]
+        else:
+            last_full = _shift_month(end_str[:7], -1)
+        last_full = min(last_full, _shift_month(self._open_month, -1))
+
+        summary = {"count": 0, "totals": {}, "categories": {}}
+        if first_full <= last_full:
+            for month, rollup in self._rollups.items():
+                if first_full <= month <= last_full:
+                    _summary_add(summary, rollup)
+            # "YYYY-MM-00" sorts after every date of the previous month and before any of this one.
+            scans = [(start_str, first_full + "-00"), (_shift_month(last_full, 1) + "-01", end_str)]
+        else:
+            scans = [(start_str, end_str)]
+
+        totals = summary["totals"]
+        categories = summary["categories"]
+        for lo, hi in scans:
+            for t in self._range_slice(lo, hi):
+                summary["count"] += 1
+                totals[t["type"]] = totals.get(t["type"], 0) + t["amount_minor"]
+                type_categories = categories.setdefault(t["type"], {})
+                type_categories[t["category"]] = type_categories.get(t["category"], 0) + t["amount_minor"]
+        return summary
+
+    def get_category_totals(self, type_trans="Витрата", start_dt=None, end_dt=None):
+        return dict(self.get_summary(start_dt, end_dt)["categories"].get(type_trans, {}))
+
+    def get_daily_totals(self):
+        dates, income, expenses = [], [], []
+        last_date_str = None
+        skipping = False
+        for t in reversed(self._sorted_transactions()):
+            if t["date"] != last_date_str:
+                last_date_str = t["date"]
+                try:
+                    dates.append(date.fromisoformat(last_date_str))
+                except ValueError:
+                    print(f"Пропуск транзакції з невірним форматом дати: {t}", file=sys.stderr)
+                    skipping = True
+                    continue
+                skipping = False
+                income.append(0)
+                expenses.append(0)
+            elif skipping:
+                continue
+            if t["type"] == "Доход":
+                income[-1] += t["amount_minor"]
+            else:
+                expenses[-1] += t["amount_minor"]
+        return dates, income, expenses
+
+    def compact(self):
+        with self._data_lock:
+            self._sync_locked()
+            seen = set()
+            unique = []
+            for t in self.transactions:
+                if t["id"] in seen:
+                    continue
+                seen.add(t["id"])
+                unique.append(t)
+            removed = len(self.transactions) - len(unique)
+            if removed:
+                self.transactions = unique
+                self._invalidate_caches()
+                self._rebuild_rollups()
+            success = self._compact_locked()
+        return success, removed
+
+    def write_csv(self, f):
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(["Transaction ID", "Amount", "Category", "Type", "Description", "Date"])
+        for t in self.get_transactions():
+            writer.writerow([t["id"], format_minor(t["amount_minor"]), t["category"], t["type"], t["description"], t["date"]])
 
     def export_to_csv(self, filename):
         if not self.transactions:
             return False, "Немає транзакцій для експорту."
         try:
             with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f, delimiter=';')
-                writer.writerow(["Transaction ID", "Amount", "Category", "Type", "Description", "Date"])
-                for t in self.get_transactions():
-                    writer.writerow([t["id"], t["amount"], t["category"], t["type"], t["description"], t["date"]])
+                self.write_csv(f)
             return True, f"Експортовано в {filename}"
         except IOError as e:
             return False, f"Не вдалося зберегти файл: {e}"
 
     def import_from_csv(self, filename):
-        imported_count = 0
-        errors = []
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f, delimiter=';')
-                header = next(reader)
-                header_map = {h.strip(): i for i, h in enumerate(header)}
-
-                required_headers = ["Amount", "Category", "Type", "Date"]
-                if not all(h in header_map for h in required_headers):
-                    missing = [h for h in required_headers if h not in header_map]
-                    return 0, f"Необхідні колонки відсутні: {', '.join(missing)}"
-
-                for row_num, row in enumerate(reader, start=2):
-                    if len(row) <= max(header_map.values()):
-                        errors.append(f"Рядок {row_num}: Недостатньо колонок.")
-                        continue
-                    try:
-                        amount_str = row[header_map["Amount"]].strip()
-                        category = row[header_map["Category"]].strip()
-                        type_ = row[header_map["Type"]].strip()
-                        date_str = row[header_map["Date"]].strip()
-                        description = row[
-                            header_map.get("Description", len(row))].strip() if "Description" in header_map and \
-                                                                                header_map["Description"] < len(
-                            row) else ""
-
-                        if not amount_str or not category or not type_ or not date_str:
-                            errors.append(f"Рядок {row_num}: Пропущені обов'язкові поля.")
-                            continue
-
-                        trans_id = None
-                        if "Transaction ID" in header_map and header_map["Transaction ID"] < len(row):
-                            id_val = row[header_map["Transaction ID"]].strip()
-                            if id_val:
-                                trans_id = id_val
-
-                        amount = float(amount_str.replace(',', '.'))
-                        datetime.strptime(date_str, '%Y-%m-%d')
-
-                        self.add_transaction(amount, category, type_, description, date_str, trans_id=trans_id)
-                        imported_count += 1
-                    except (ValueError, IndexError) as e:
-                        errors.append(f"Рядок {row_num}: Помилка даних або формату - {e}.")
-                    except Exception as e:
-                        errors.append(f"Рядок {row_num}: Неочікувана помилка - {e}.")
-
-            status_message = f"Імпорт завершено. Додано {imported_count} транзакцій."
-            if errors:
-                status_message += "\nВиявлені помилки:\n" + "\n".join(errors[:5])
-                if len(errors) > 5:
-                    status_message += f"\n... та ще {len(errors) - 5} помилок (див. консоль/логи)."
-                    print("Детальні помилки імпорту:", "\n".join(errors))
-            return imported_count, status_message
-
+            with open(filename, 'r', newline='', encoding='utf-8-sig') as f:
+                return self.import_from_stream(f)
         except FileNotFoundError:
-            return 0, "Файл не знайдено."
+            return False, 0, "Файл не знайдено."
         except ValueError as e:
-            return 0, f"Помилка формату файлу: {e}"
+            return False, 0, f"Помилка формату файлу: {e}"
         except Exception as e:
-            return 0, f"Невідома помилка імпорту: {e}"
+            return False, 0, f"Невідома помилка імпорту: {e}"
+
+    def import_from_stream(self, f):
+        errors = []
+        try:
+            rows = parse_csv_rows(f, errors)
+        except ValueError as e:
+            return False, 0, str(e)
+
+        # Rows are committed in batches while the stream is read, so a read error part-way through
+        # leaves the earlier batches in place; report them instead of failing the whole import.
+        read_errors = []
+
+        def rows_until_read_error():
+            try:
+                yield from with_content_ids(rows)
+            except (ValueError, csv.Error, OSError) as e:
+                read_errors.append(e)
+
+        imported_count, duplicate_count = self.add_transactions_batch(rows_until_read_error())
+        if read_errors:
+            return False, imported_count, (
+                f"Імпорт перервано: помилка читання файлу - {read_errors[0]}. "
+                f"До помилки додано {imported_count} транзакцій; повторний імпорт виправленого файлу їх пропустить.")
+        return True, imported_count, import_status_message(imported_count, duplicate_count, errors)
+
+    def add_transactions_batch(self, rows, batch_size=IMPORT_BATCH_SIZE):
+        imported_count = 0
+        duplicate_count = 0
+        try:
+            for row in rows:
+                if self.add_transaction(save=False, **row) is None:
+                    duplicate_count += 1
+                else:
+                    imported_count += 1
+                    if imported_count == SORTED_VIEW_INSERT_LIMIT:
+                        self._invalidate_caches()
+                if len(self._unsaved_ops) >= batch_size:
+                    self._flush_unsaved()
+        finally:
+            self._flush_unsaved()
+        return imported_count, duplicate_count
+
+    def _reload_recurring_if_changed(self):
+        signature = _file_signature(self.recurring_file)
+        if signature != self._recurring_signature:
+            self.recurring_payments = self._load_data_from_file(self.recurring_file, is_recurring=True)
+            self._recurring_signature = signature
+
+    def _save_recurring_payments(self):
+        self._save_data_to_file(self.recurring_payments, self.recurring_file, is_recurring=True)
+        self._recurring_signature = _file_signature(self.recurring_file)
 
     def add_recurring_payment(self, details):
         details['start_date'] = datetime.strptime(details['start_date'], '%Y-%m-%d')
         details['next_due_date'] = details['start_date']
         details['id'] = uuid.uuid4().hex
-        self.recurring_payments.append(details)
-        self._save_data_to_file(self.recurring_payments, RECURRING_PAYMENTS_FILE, is_recurring=True)
-
-    def _calculate_next_due_date(self, last_due_date: datetime, frequency: str):
-        if frequency == "Щомісячно":
-            month = last_due_date.month
-            year = last_due_date.year
-            day = last_due_date.day
-
-            if month == 12:
-                month = 1
-                year += 1
-            else:
-                month += 1
-
-            max_day_in_next_month = calendar.monthrange(year, month)[1]
-            day = min(day, max_day_in_next_month)
-            return datetime(year, month, day)
-
-        elif frequency == "Щотижнево":
-            return last_due_date + timedelta(weeks=1)
-        return None
-
-    def _process_recurring_payments(self):
+        with self._recurring_lock:
+            self._reload_recurring_if_changed()
+            self.recurring_payments.append(details)
+            self._save_recurring_payments()
+
+    def process_recurring_payments(self):
+        # Holding the lock and re-reading the rules keeps two instances from posting the same due payments.
+        with self._recurring_lock:
+            self._reload_recurring_if_changed()
+            return self._process_recurring_payments_locked()
+
+    def _process_recurring_payments_locked(self):
         today = datetime.now()
         changed = False
+        posted = 0
         for rule in self.recurring_payments:
             if isinstance(rule.get('start_date'), str):
                 rule['start_date'] = datetime.strptime(rule['start_date'], '%Y-%m-%d')
@@ -205,32 +725,39 @@ class FinanceManager:
 
             while rule['next_due_date'].date() <= today.date():
                 if rule['next_due_date'].date() < rule['start_date'].date():
-                    rule['next_due_date'] = self._calculate_next_due_date(rule['next_due_date'], rule['frequency'])
+                    rule['next_due_date'] = calculate_next_due_date(rule['next_due_date'], rule['frequency'])
                     if not rule['next_due_date']: break
                     changed = True
                     continue
 
                 self.add_transaction(
-                    amount=rule['amount'],
+                    amount_minor=rule['amount_minor'],
                     cat=rule['category'],
                     type_trans=rule['type'],
                     desc=f"(Авто) {rule['description']}",
-                    date_str=rule['next_due_date'].strftime('%Y-%m-%d')
+                    date_str=rule['next_due_date'].strftime('%Y-%m-%d'),
+                    save=False
                 )
+                posted += 1
 
-                next_date = self._calculate_next_due_date(rule['next_due_date'], rule['frequency'])
+                next_date = calculate_next_due_date(rule['next_due_date'], rule['frequency'])
                 if not next_date:
-                    print(f"Помилка: Не вдалося розрахувати наступну дату для платежу ID {rule.get('id')}")
+                    print(f"Помилка: Не вдалося розрахувати наступну дату для платежу ID {rule.get('id')}",
+                          file=sys.stderr)
                     break
                 rule['next_due_date'] = next_date
                 changed = True
 
+        self._flush_unsaved()
         if changed:
-            self._save_data_to_file(self.recurring_payments, RECURRING_PAYMENTS_FILE, is_recurring=True)
+            self._save_recurring_payments()
+        return posted
 
     def get_recurring_payments(self):
         return sorted(self.recurring_payments, key=lambda x: x.get('next_due_date') or datetime.min)
 
     def delete_recurring_payment(self, payment_id):
-        self.recurring_payments = [p for p in self.recurring_payments if p.get('id') != payment_id]
-        self._save_data_to_file(self.recurring_payments, RECURRING_PAYMENTS_FILE, is_recurring=True)
\ No newline at end of file
+        with self._recurring_lock:
+            self._reload_recurring_if_changed()
+            self.recurring_payments = [p for p in self.recurring_payments if p.get('id') != payment_id]
+            self._save_recurring_payments()
\ No newline at end of file
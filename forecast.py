@@ -0,0 +1,113 @@
+# forecast.py
+
+import calendar
+from datetime import datetime, date
+
+from config import FORECAST_MONTHS
+from data_manager import calculate_next_due_date
+
+
+def _add_months(day, months):
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _rule_signature(rule):
+    return (rule.get("amount_minor"), rule.get("type"), rule.get("frequency"),
+            rule.get("start_date"), rule.get("next_due_date"))
+
+
+# Projects the balance forward from the recurring rules without creating transactions. Each rule's
+# dated contributions are cached by rule id together with the fields they depend on, and the
+# combined per-day deltas are patched by difference, so after one rule is added, edited, advanced
+# or deleted only that rule is expanded again.
+class ForecastEngine:
+    def __init__(self, manager):
+        self.manager = manager
+        self._rule_cache = {}
+        self._combined = {}
+        self._window = None
+
+    def _occurrences(self, rule, today, until):
+        due = rule.get("next_due_date") or rule.get("start_date")
+        start = rule.get("start_date") or due
+        if due is None:
+            return
+        while due is not None and due.date() <= until:
+            if due.date() >= start.date():
+                # Overdue payments are posted on the next recurring run, i.e. no earlier than today.
+                yield max(due.date(), today)
+            due = calculate_next_due_date(due, rule["frequency"])
+
+    def _expand_rule(self, rule, today, until):
+        deltas = {}
+        if rule.get("type") not in ("Доход", "Витрата"):
+            return deltas
+        amount = rule["amount_minor"] if rule["type"] == "Доход" else -rule["amount_minor"]
+        for day in self._occurrences(rule, today, until):
+            deltas[day] = deltas.get(day, 0) + amount
+        return deltas
+
+    def _apply_deltas(self, deltas, sign):
+        for day, amount in deltas.items():
+            total = self._combined.get(day, 0) + sign * amount
+            if total:
+                self._combined[day] = total
+            else:
+                self._combined.pop(day, None)
+
+    def _update_rules(self, today, until):
+        if self._window != (today, until):
+            self._rule_cache = {}
+            self._combined = {}
+            self._window = (today, until)
+
+        current_ids = set()
+        for rule in self.manager.recurring_payments:
+            rule_id = rule.get("id") or id(rule)
+            current_ids.add(rule_id)
+            signature = _rule_signature(rule)
+            cached = self._rule_cache.get(rule_id)
+            if cached is not None and cached[0] == signature:
+                continue
+            if cached is not None:
+                self._apply_deltas(cached[1], -1)
+            deltas = self._expand_rule(rule, today, until)
+            self._apply_deltas(deltas, 1)
+            self._rule_cache[rule_id] = (signature, deltas)
+
+        for rule_id in list(self._rule_cache):
+            if rule_id not in current_ids:
+                self._apply_deltas(self._rule_cache.pop(rule_id)[1], -1)
+
+    def forecast(self, months=FORECAST_MONTHS, today=None):
+        today = today or datetime.now().date()
+        until = _add_months(today, months)
+        self._update_rules(today, until)
+
+        today_dt = datetime(today.year, today.month, today.day)
+        totals = self.manager.get_summary(end_dt=today_dt)["totals"]
+        balance = totals.get("Доход", 0) - totals.get("Витрата", 0)
+
+        deltas = dict(self._combined)
+        # Transactions already entered with a future date land on their own day.
+        scheduled = self.manager.get_transactions_by_date(today_dt, datetime(until.year, until.month, until.day))
+        today_str = today.isoformat()
+        for t in scheduled:
+            if t["date"] <= today_str or t["type"] not in ("Доход", "Витрата"):
+                continue
+            day = date.fromisoformat(t["date"])
+            amount = t["amount_minor"] if t["type"] == "Доход" else -t["amount_minor"]
+            deltas[day] = deltas.get(day, 0) + amount
+
+        dates = [today]
+        balances = [balance]
+        for day in sorted(deltas):
+            balance += deltas[day]
+            if day == today:
+                balances[0] = balance
+                continue
+            dates.append(day)
+            balances.append(balance)
+        return dates, balances
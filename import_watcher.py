@@ -0,0 +1,130 @@
+# import_watcher.py
+
+import hashlib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from config import WATCH_DIR, IMPORT_WORKERS, IMPORT_BATCH_SIZE, IMPORT_LEDGER_FILE
+from data_manager import parse_csv_rows, with_content_ids, import_status_message
+
+
+def _parse_statement(path):
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    errors = []
+    # Parsing happens off the polling thread, so the (bounded) statement is materialised here.
+    rows = list(with_content_ids(parse_csv_rows(io.StringIO(content.decode("utf-8-sig"), newline=""), errors)))
+    return digest, rows, errors
+
+
+# Polls a directory for new CSV statements. Parsing runs on a bounded thread pool; results are
+# committed to the FinanceManager only from poll(), i.e. on the caller's thread, in batches.
+class ImportWatcher:
+    def __init__(self, manager, watch_dir=WATCH_DIR, ledger_file=None, workers=IMPORT_WORKERS,
+                 batch_size=IMPORT_BATCH_SIZE):
+        self.manager = manager
+        self.watch_dir = watch_dir
+        self.ledger_file = ledger_file or os.path.join(watch_dir, IMPORT_LEDGER_FILE)
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._in_flight = {}
+        self._last_seen = {}
+        self.processed = self._load_ledger()
+
+    def _load_ledger(self):
+        try:
+            with open(self.ledger_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, IOError):
+            print(f"Warning: Could not load or parse {self.ledger_file}. All files will be re-checked.",
+                  file=sys.stderr)
+            return {}
+
+    def _save_ledger(self):
+        tmp_filename = self.ledger_file + ".tmp"
+        try:
+            with open(tmp_filename, "w", encoding="utf-8") as f:
+                json.dump(self.processed, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_filename, self.ledger_file)
+        except IOError as e:
+            print(f"Error saving {self.ledger_file}: {e}", file=sys.stderr)
+
+    def _scan(self, require_stable):
+        try:
+            entries = list(os.scandir(self.watch_dir))
+        except FileNotFoundError:
+            return []
+
+        ready = []
+        seen = {}
+        for entry in entries:
+            if not entry.is_file() or not entry.name.lower().endswith(".csv"):
+                continue
+            st = entry.stat()
+            signature = [st.st_size, st.st_mtime_ns]
+            seen[entry.name] = signature
+            record = self.processed.get(entry.name)
+            if record is not None and record.get("signature") == signature:
+                continue
+            if entry.name in self._in_flight:
+                continue
+            # A file whose size or mtime is still changing between polls is probably being copied.
+            if require_stable and self._last_seen.get(entry.name) != signature:
+                continue
+            ready.append((entry.name, signature))
+        self._last_seen = seen
+        return ready
+
+    def poll(self, require_stable=True):
+        for name, signature in self._scan(require_stable):
+            path = os.path.join(self.watch_dir, name)
+            self._in_flight[name] = (signature, self._executor.submit(_parse_statement, path))
+
+        results = []
+        for name, (signature, future) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+            del self._in_flight[name]
+            results.append(self._commit(name, signature, future))
+        if results:
+            self._save_ledger()
+        return results
+
+    def _commit(self, name, signature, future):
+        record = {"signature": signature, "processed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        try:
+            digest, rows, errors = future.result()
+        except FileNotFoundError:
+            record.update(status="error", imported=0, duplicates=0, errors=0, message="Файл не знайдено.")
+        except (ValueError, UnicodeDecodeError) as e:
+            record.update(status="error", imported=0, duplicates=0, errors=0,
+                          message=f"Помилка формату файлу: {e}")
+        except Exception as e:
+            record.update(status="error", imported=0, duplicates=0, errors=0,
+                          message=f"Невідома помилка імпорту: {e}")
+        else:
+            previous = self.processed.get(name)
+            if previous is not None and previous.get("sha256") == digest:
+                # Touched but unchanged: nothing to import again.
+                imported_count = duplicate_count = 0
+            else:
+                imported_count, duplicate_count = self.manager.add_transactions_batch(rows, self.batch_size)
+            record.update(status="ok", sha256=digest, imported=imported_count, duplicates=duplicate_count,
+                          errors=len(errors),
+                          message=import_status_message(imported_count, duplicate_count, errors))
+        self.processed[name] = record
+        return dict(record, file=name)
+
+    def pending(self):
+        return len(self._in_flight)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,117 @@
+# load_test.py
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+from config import API_HOST, API_PORT
+
+READ_PATHS = [
+    "/balance",
+    "/categories",
+    "/categories?type=" + quote("Доход"),
+    "/transactions?limit=50",
+]
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode("utf-8") + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Сервер закрив з'єднання.")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    await reader.readexactly(length)
+    return status
+
+
+def _random_path(rng):
+    if rng.random() < 0.3:
+        end = datetime.now() - timedelta(days=rng.randint(0, 365))
+        start = end - timedelta(days=rng.randint(1, 90))
+        return f"/transactions?start={start:%Y-%m-%d}&end={end:%Y-%m-%d}&limit=100"
+    return rng.choice(READ_PATHS)
+
+
+async def _worker(host, port, requests, write_ratio, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            if rng.random() < write_ratio:
+                method, path = "POST", "/transactions"
+                payload = {
+                    "amount": round(rng.uniform(1, 500), 2),
+                    "category": rng.choice(["Їжа", "Транспорт", "Житло", "Розваги"]),
+                    "type": rng.choice(["Доход", "Витрата"]),
+                    "description": "load test",
+                    "date": (datetime.now() - timedelta(days=rng.randint(0, 365))).strftime("%Y-%m-%d")
+                }
+            else:
+                method, path, payload = "GET", _random_path(rng), None
+            started = time.perf_counter()
+            status = await _request(reader, writer, method, path, payload)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+async def run_load_test(host, port, connections, requests, write_ratio):
+    latencies = []
+    errors = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(host, port, requests, write_ratio, latencies, errors, seed)
+        for seed in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"Запитів: {total} за {elapsed:.2f} с ({total / elapsed:.0f} запитів/с), помилок: {len(errors)}")
+    print("Затримка, мс: "
+          f"p50={_percentile(latencies, 0.50) * 1000:.2f} "
+          f"p95={_percentile(latencies, 0.95) * 1000:.2f} "
+          f"p99={_percentile(latencies, 0.99) * 1000:.2f} "
+          f"max={latencies[-1] * 1000 if latencies else 0.0:.2f}")
+    return total, elapsed, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="load_test.py", description="Навантажувальний тест локального API.")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("-c", "--connections", type=int, default=50, help="кількість одночасних з'єднань")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="запитів на з'єднання")
+    parser.add_argument("-w", "--write-ratio", type=float, default=0.0,
+                        help="частка запитів на запис (додає транзакції до реального файлу даних!)")
+    args = parser.parse_args(argv)
+    asyncio.run(run_load_test(args.host, args.port, args.connections, args.requests, args.write_ratio))
+
+
+if __name__ == "__main__":
+    main()
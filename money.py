@@ -0,0 +1,39 @@
+# money.py
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Amounts are kept as integer minor units (kopiyky) everywhere inside the program and are only
+# converted to and from "123.45" strings where they enter or leave it (GUI, CSV, JSON API).
+MINOR_UNITS = 100
+
+
+def to_minor(value):
+    if isinstance(value, bool):
+        raise ValueError(f"Неправильна сума: '{value}'")
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    if isinstance(value, float):
+        value = repr(value)
+    if isinstance(value, str):
+        value = value.strip().replace(',', '.')
+    try:
+        amount = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"Неправильна сума: '{value}'")
+    if not amount.is_finite():
+        raise ValueError(f"Неправильна сума: '{value}'")
+    try:
+        return int((amount * MINOR_UNITS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        # quantize() cannot represent more digits than the decimal context precision.
+        raise ValueError(f"Занадто велика сума: '{value}'")
+
+
+def format_minor(minor):
+    sign = "-" if minor < 0 else ""
+    whole, fraction = divmod(abs(minor), MINOR_UNITS)
+    return f"{sign}{whole}.{fraction:02d}"
+
+
+def minor_to_float(minor):
+    return minor / MINOR_UNITS
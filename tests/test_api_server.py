@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+from api_server import FinanceAPIServer, ReadWriteLock
+from data_manager import FinanceManager
+
+
+def _with_server(tmp_path, scenario):
+    manager = FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+
+    async def run():
+        server = FinanceAPIServer(manager, "127.0.0.1", 0)
+        await server.start()
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            await scenario(port)
+        finally:
+            server._refresh_task.cancel()
+            server._server.close()
+            await server._server.wait_closed()
+
+    asyncio.run(run())
+    return manager
+
+
+async def _send(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body.decode("utf-8"))
+
+
+async def _request(port, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\nContent-Length: {len(body)}\r\n\r\n"
+    return await _send(port, head.encode("latin-1") + body)
+
+
+def test_transaction_lifecycle(tmp_path):
+    async def scenario(port):
+        status, created = await _request(port, "POST", "/transactions", {
+            "amount": "12.30", "category": "Їжа", "type": "Витрата", "date": "2025-1-5"})
+        assert status == 201 and created["date"] == "2025-01-05" and created["amount"] == "12.30"
+        await _request(port, "POST", "/transactions", {
+            "amount": 100, "category": "Зарплата", "type": "Доход", "date": "2025-02-01"})
+
+        assert await _request(port, "GET", "/balance") == (200, {"balance": "87.70"})
+        status, page = await _request(port, "GET", "/transactions?start=2025-01-01&end=2025-01-31")
+        assert status == 200 and page["total"] == 1 and page["transactions"][0]["id"] == created["id"]
+
+        assert (await _request(port, "DELETE", "/transactions/" + created["id"]))[0] == 200
+        assert (await _request(port, "DELETE", "/transactions/" + created["id"]))[0] == 404
+
+    manager = _with_server(tmp_path, scenario)
+    assert [t["category"] for t in manager.transactions] == ["Зарплата"]
+
+
+def test_transaction_pages(tmp_path):
+    async def scenario(port):
+        status, page = await _request(port, "GET", "/transactions?offset=2&limit=3")
+        assert status == 200
+        assert (page["total"], page["offset"], page["limit"]) == (10, 2, 3)
+        assert [t["date"] for t in page["transactions"]] == ["2025-01-08", "2025-01-07", "2025-01-06"]
+
+        status, page = await _request(port, "GET", "/transactions?start=2025-01-03&end=2025-01-04&offset=1")
+        assert page["total"] == 2 and [t["date"] for t in page["transactions"]] == ["2025-01-03"]
+
+        status, page = await _request(port, "GET", "/transactions?limit=100000&offset=50")
+        assert status == 200 and page["limit"] == 500 and page["transactions"] == []
+
+    manager = FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+    manager.add_transactions_batch([{"amount_minor": 100, "cat": "Їжа", "type_trans": "Витрата", "desc": "",
+                                     "date_str": f"2025-01-{day:02d}"} for day in range(1, 11)])
+    _with_server(tmp_path, scenario)
+
+
+def test_bad_requests(tmp_path):
+    async def scenario(port):
+        bad_bodies = [
+            {"amount": "abc", "category": "Їжа", "type": "Витрата", "date": "2025-01-05"},
+            {"amount": 1e30, "category": "Їжа", "type": "Витрата", "date": "2025-01-05"},
+            {"amount": "1", "category": "Їжа", "type": "Витрата", "date": "05.01.2025"},
+            {"amount": "1", "category": "Їжа", "type": "Інше", "date": "2025-01-05"},
+            {"amount": "1", "type": "Витрата", "date": "2025-01-05"},
+        ]
+        for body in bad_bodies:
+            assert (await _request(port, "POST", "/transactions", body))[0] == 400
+        assert (await _request(port, "GET", "/transactions?limit=-1"))[0] == 400
+        assert (await _request(port, "GET", "/transactions?start=2025-01-01"))[0] == 400
+        assert (await _request(port, "GET", "/nowhere"))[0] == 404
+        assert (await _request(port, "PUT", "/balance"))[0] == 405
+
+        assert (await _send(port, b"GET /balance HTTP/1.1\r\nContent-Length: x\r\n\r\n"))[0] == 400
+        assert (await _send(port, b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n"))[0] == 400
+        assert (await _send(port, b"GET /balance HTTP/1.1\r\nX-Big: " + b"a" * 70000 + b"\r\n\r\n"))[0] == 400
+
+    _with_server(tmp_path, scenario)
+
+
+def test_read_write_lock():
+    async def scenario():
+        lock = ReadWriteLock()
+        events = []
+
+        async def reader(name, hold):
+            async with lock.read_locked():
+                events.append(f"{name}+")
+                await asyncio.sleep(hold)
+                events.append(f"{name}-")
+
+        async def writer():
+            async with lock.write_locked():
+                events.append("w+")
+                await asyncio.sleep(0.01)
+                events.append("w-")
+
+        first = asyncio.ensure_future(reader("r1", 0.05))
+        second = asyncio.ensure_future(reader("r2", 0.05))
+        await asyncio.sleep(0.01)
+        write = asyncio.ensure_future(writer())
+        await asyncio.sleep(0.01)
+        # A reader arriving while a writer waits queues behind it.
+        late = asyncio.ensure_future(reader("r3", 0))
+        await asyncio.gather(first, second, write, late)
+        return events
+
+    events = asyncio.run(scenario())
+    assert events[:2] == ["r1+", "r2+"]
+    assert events.index("w+") > max(events.index("r1-"), events.index("r2-"))
+    assert events.index("w-") == events.index("w+") + 1
+    assert events.index("r3+") > events.index("w-")
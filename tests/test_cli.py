@@ -0,0 +1,53 @@
+import cli
+from data_manager import FinanceManager
+
+
+def _run(tmp_path, *argv):
+    data = str(tmp_path / "data.json")
+    recurring = str(tmp_path / "recurring.json")
+    return cli.main(["--data", data, "--recurring", recurring, *argv])
+
+
+def test_import_reports_success_and_file_errors(tmp_path):
+    good = tmp_path / "good.csv"
+    good.write_text("Amount;Category;Type;Description;Date\n10.50;Їжа;Витрата;;2025-01-05\n", encoding="utf-8")
+    bad = tmp_path / "bad.csv"
+    bad.write_text("Amount;Category\n1;x\n", encoding="utf-8")
+
+    assert _run(tmp_path, "import", str(good)) == 0
+    assert _run(tmp_path, "import", str(bad)) == 1
+    assert _run(tmp_path, "import", str(tmp_path / "missing.csv")) == 1
+
+
+def test_import_with_only_row_errors_is_not_a_failure(tmp_path):
+    rows = tmp_path / "rows.csv"
+    rows.write_text("Amount;Category;Type;Date\nabc;Їжа;Витрата;2025-01-05\n", encoding="utf-8")
+
+    manager = FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+    success, imported_count, message = manager.import_from_csv(str(rows))
+    assert success and imported_count == 0
+    assert _run(tmp_path, "import", str(rows)) == 0
+
+
+def test_balance_after_import(tmp_path, capsys):
+    statement = tmp_path / "statement.csv"
+    statement.write_text("Amount;Category;Type;Date\n100;Зарплата;Доход;2025-01-01\n"
+                         "20.25;Їжа;Витрата;2025-01-02\n", encoding="utf-8")
+    _run(tmp_path, "import", str(statement))
+    capsys.readouterr()
+
+    assert _run(tmp_path, "balance") == 0
+    assert capsys.readouterr().out.strip() == "79.75"
+
+
+def test_export_to_stdout_keeps_diagnostics_out_of_the_csv(tmp_path, capsys):
+    manager = FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+    manager.add_transaction(1000, "Їжа", "Витрата", "", "2025-01-05")
+    with open(manager.journal_file, "ab") as f:
+        f.write(b"{not json\n")
+    capsys.readouterr()
+
+    assert _run(tmp_path, "export") == 0
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[0] == "Transaction ID;Amount;Category;Type;Description;Date"
+    assert "corrupted line" in captured.err
@@ -0,0 +1,143 @@
+import errno
+import io
+import os
+from datetime import datetime
+
+from data_manager import FinanceManager, parse_csv_rows
+
+
+def _manager(tmp_path):
+    return FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+
+
+def test_dates_are_stored_zero_padded(tmp_path):
+    manager = _manager(tmp_path)
+    t = manager.add_transaction(500, "Їжа", "Витрата", "", "2025-1-5")
+    assert t["date"] == "2025-01-05"
+
+    found = manager.get_transactions_by_date(datetime(2025, 1, 1), datetime(2025, 1, 31))
+    assert [x["id"] for x in found] == [t["id"]]
+    assert manager.get_summary(datetime(2025, 1, 1), datetime(2025, 1, 31))["totals"] == {"Витрата": 500}
+
+
+def test_csv_dates_are_stored_zero_padded():
+    errors = []
+    rows = list(parse_csv_rows(io.StringIO("Amount;Category;Type;Date\n1;Їжа;Витрата;2025-3-7\n"), errors))
+    assert not errors
+    assert rows[0]["date_str"] == "2025-03-07"
+
+
+def test_failed_compaction_keeps_journal(tmp_path, monkeypatch):
+    manager = _manager(tmp_path)
+    for day in range(1, 4):
+        manager.add_transaction(100, "Їжа", "Витрата", "", f"2025-01-0{day}")
+
+    real_replace = os.replace
+
+    def failing_replace(src, dst):
+        if dst == manager.data_file:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    assert manager.compact() == (False, 0)
+    monkeypatch.setattr(os, "replace", real_replace)
+
+    assert os.path.getsize(manager.journal_file) > 0
+    assert len(_manager(tmp_path).transactions) == 3
+
+
+def test_external_changes_are_kept_only_when_tracked(tmp_path):
+    writer = _manager(tmp_path)
+    tracked = FinanceManager(writer.data_file, writer.recurring_file, process_recurring=False, track_changes=True)
+    untracked = _manager(tmp_path)
+
+    t = writer.add_transaction(100, "Їжа", "Витрата", "", "2025-01-05")
+    untracked.add_transaction(200, "Кава", "Витрата", "", "2025-01-06")
+    assert untracked.has_transaction(t["id"])
+    assert untracked.refresh() == []
+
+    changes = tracked.refresh()
+    assert [op["op"] for op in changes] == ["add", "add"]
+    assert tracked.refresh() == []
+
+
+def _state(manager):
+    return sorted((t["id"], t["amount_minor"], t["date"]) for t in manager.transactions)
+
+
+def test_two_managers_share_one_file(tmp_path):
+    first = _manager(tmp_path)
+    second = _manager(tmp_path)
+
+    a = first.add_transaction(100, "Їжа", "Витрата", "", "2025-01-05")
+    b = second.add_transaction(200, "Зарплата", "Доход", "", "2025-02-01")
+    first.refresh()
+    assert _state(first) == _state(second)
+
+    second.delete_transaction_by_id(a["id"])
+    first.add_transactions_batch([
+        {"amount_minor": 300, "cat": "Кава", "type_trans": "Витрата", "desc": "", "date_str": "2025-02-03"},
+        {"amount_minor": 400, "cat": "Кава", "type_trans": "Витрата", "desc": "", "date_str": "2025-02-04"},
+    ])
+    second.refresh()
+    assert _state(first) == _state(second) == _state(_manager(tmp_path))
+    assert not first.has_transaction(a["id"]) and first.has_transaction(b["id"])
+
+    assert first.compact() == (True, 0)
+    assert os.path.getsize(first.journal_file) == 0
+    c = second.add_transaction(500, "Їжа", "Витрата", "", "2025-03-01")
+    first.refresh()
+    reloaded = _manager(tmp_path)
+    assert _state(first) == _state(second) == _state(reloaded)
+    assert first.get_balance() == second.get_balance() == reloaded.get_balance() == 200 - 300 - 400 - 500
+
+    first.clear_transactions()
+    second.refresh()
+    assert second.transactions == [] and not second.has_transaction(c["id"])
+    assert _manager(tmp_path).transactions == []
+
+
+def test_stream_import_commits_in_batches(tmp_path):
+    lines = "".join(f"{n}.00;Їжа;Витрата;2025-01-{n % 28 + 1:02d}\n" for n in range(1, 26))
+    manager = _manager(tmp_path)
+    commits = []
+    real_commit = manager._commit
+    manager._commit = lambda ops: (commits.append(len(ops)), real_commit(ops))
+
+    rows = parse_csv_rows(io.StringIO("Amount;Category;Type;Date\n" + lines), [])
+    assert manager.add_transactions_batch(rows, batch_size=10) == (25, 0)
+    assert commits == [10, 10, 5]
+    assert len(_manager(tmp_path).transactions) == 25
+
+
+def test_sorted_view_survives_bulk_batches(tmp_path):
+    manager = _manager(tmp_path)
+    row = lambda n: {"amount_minor": n, "cat": "Їжа", "type_trans": "Витрата", "desc": "",
+                     "date_str": f"2025-{n % 12 + 1:02d}-{n % 28 + 1:02d}"}
+    manager.add_transactions_batch([row(n) for n in range(10)])
+    manager.get_transactions()
+
+    for count in (5, 400):
+        manager.add_transactions_batch([row(n) for n in range(count)])
+        expected = sorted(manager.transactions, key=lambda t: t["date"], reverse=True)
+        assert [t["date"] for t in manager.get_transactions()] == [t["date"] for t in expected]
+
+
+def test_read_error_mid_stream_reports_committed_rows(tmp_path):
+    good_rows = "".join(f"{n}.00;Їжа;Витрата;;2025-01-{n % 28 + 1:02d}\n" for n in range(1, 3001))
+    header = "Amount;Category;Type;Description;Date\n"
+    broken = tmp_path / "broken.csv"
+    broken.write_bytes((header + good_rows).encode("utf-8") + b"\xff;bad;\n" + "1;Їжа;Витрата;;2025-02-01\n".encode())
+
+    manager = _manager(tmp_path)
+    success, imported_count, message = manager.import_from_csv(str(broken))
+    assert not success and 0 < imported_count <= 3000
+    assert imported_count == len(manager.transactions) == len(_manager(tmp_path).transactions)
+    assert str(imported_count) in message
+
+    fixed = tmp_path / "fixed.csv"
+    fixed.write_text(header + good_rows + "1;Їжа;Витрата;;2025-02-01\n", encoding="utf-8")
+    success, retried_count, _ = manager.import_from_csv(str(fixed))
+    assert success and retried_count == 3001 - imported_count
+    assert len(manager.transactions) == 3001
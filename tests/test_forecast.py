@@ -0,0 +1,40 @@
+from datetime import date, datetime
+
+import pytest
+
+import cli
+from data_manager import FinanceManager
+from forecast import ForecastEngine
+
+
+def _rule(rule_id, amount_minor, type_trans, frequency, start, next_due):
+    return {"id": rule_id, "amount_minor": amount_minor, "type": type_trans, "frequency": frequency,
+            "category": "Регулярне", "description": "", "start_date": start, "next_due_date": next_due}
+
+
+def test_forecast_follows_rules_and_updates_incrementally(tmp_path):
+    manager = FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+    manager.add_transaction(100000, "Зарплата", "Доход", "", "2026-10-01")
+    manager.add_transaction(5000, "Їжа", "Витрата", "", "2026-11-02")
+    manager.recurring_payments = [
+        _rule("salary", 50000, "Доход", "Щомісячно", datetime(2026, 9, 5), datetime(2026, 11, 5)),
+        _rule("coffee", 1000, "Витрата", "Щотижнево", datetime(2026, 10, 1), datetime(2026, 10, 15)),
+    ]
+    engine = ForecastEngine(manager)
+    today = date(2026, 10, 19)
+
+    dates, balances = engine.forecast(1, today=today)
+    # The overdue weekly payment is due today, the future-dated purchase lands on its own day.
+    assert dates[:4] == [today, date(2026, 10, 22), date(2026, 10, 29), date(2026, 11, 2)]
+    assert balances[:4] == [99000, 98000, 97000, 92000]
+    assert (dates[-1], balances[-1]) == (date(2026, 11, 19), 139000)
+
+    manager.recurring_payments.pop()
+    assert engine.forecast(1, today=today) == ForecastEngine(manager).forecast(1, today=today)
+
+
+@pytest.mark.parametrize("months", ["0", "121", "100000000", "abc"])
+def test_cli_forecast_rejects_bad_month_counts(tmp_path, months):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["--data", str(tmp_path / "data.json"), "forecast", "--months", months])
+    assert exc.value.code == 2
@@ -0,0 +1,35 @@
+import time
+
+from data_manager import FinanceManager
+from import_watcher import ImportWatcher
+
+HEADER = "Amount;Category;Type;Description;Date\n"
+
+
+def _drain(watcher):
+    results = watcher.poll(require_stable=False)
+    while watcher.pending():
+        time.sleep(0.01)
+        results += watcher.poll(require_stable=False)
+    return results
+
+
+def test_overlapping_statements_are_deduplicated(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    manager = FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+    watcher = ImportWatcher(manager, str(inbox), workers=2)
+    try:
+        (inbox / "day1.csv").write_text(HEADER + "50;Кава;Витрата;;2025-01-05\n"
+                                                 "50;Кава;Витрата;;2025-01-05\n", encoding="utf-8")
+        [result] = _drain(watcher)
+        assert (result["imported"], result["duplicates"]) == (2, 0)
+
+        (inbox / "day2.csv").write_text(HEADER + "50;Кава;Витрата;;2025-01-05\n"
+                                                 "50;Кава;Витрата;;2025-01-05\n"
+                                                 "120;Їжа;Витрата;;2025-01-06\n", encoding="utf-8")
+        [result] = _drain(watcher)
+        assert (result["imported"], result["duplicates"]) == (1, 2)
+        assert len(manager.transactions) == 3
+    finally:
+        watcher.shutdown()
@@ -0,0 +1,34 @@
+import pytest
+
+from data_manager import _normalize_amount
+from money import to_minor, format_minor, minor_to_float
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("12.34", 1234), ("12,34", 1234), (" 7 ", 700), (5, 500), (-3, -300),
+    ("0.005", 1), ("0.004", 0), ("2.675", 268), ("-2.675", -268), (2.675, 268), (0.1, 10), ("1e3", 100000),
+])
+def test_to_minor_rounds_half_up(value, expected):
+    assert to_minor(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "abc", "1.2.3", "nan", "inf", "-Infinity", None, True, False,
+                                   "1e30", 1e30, "9" * 29, [1]])
+def test_to_minor_rejects_invalid_and_oversized_input(value):
+    with pytest.raises(ValueError):
+        to_minor(value)
+
+
+def test_format_minor():
+    assert [format_minor(v) for v in (0, 5, 1234, -1234, -5)] == ["0.00", "0.05", "12.34", "-12.34", "-0.05"]
+    assert minor_to_float(1234) == 12.34
+
+
+def test_legacy_float_amounts_are_migrated():
+    legacy = {"id": "a", "amount": 19.99, "category": "Їжа", "type": "Витрата", "description": "", "date": "2025-01-05"}
+    migrated = _normalize_amount(legacy)
+    assert migrated["amount_minor"] == 1999 and "amount" not in migrated
+    assert _normalize_amount({"id": "c", "amount": 0.1 + 0.2})["amount_minor"] == 30
+
+    current = {"id": "b", "amount_minor": 500}
+    assert _normalize_amount(current) == {"id": "b", "amount_minor": 500}
@@ -0,0 +1,97 @@
+import calendar
+import json
+import random
+from datetime import datetime
+
+import data_manager
+from data_manager import FinanceManager
+
+
+def _manager(tmp_path):
+    return FinanceManager(str(tmp_path / "data.json"), str(tmp_path / "recurring.json"), process_recurring=False)
+
+
+def _naive_summary(manager, start_dt=None, end_dt=None):
+    start = start_dt.strftime('%Y-%m-%d') if start_dt else "0000"
+    end = end_dt.strftime('%Y-%m-%d') if end_dt else "9999"
+    summary = {"count": 0, "totals": {}, "categories": {}}
+    for t in manager.transactions:
+        if start <= t["date"] <= end:
+            summary["count"] += 1
+            summary["totals"][t["type"]] = summary["totals"].get(t["type"], 0) + t["amount_minor"]
+            categories = summary["categories"].setdefault(t["type"], {})
+            categories[t["category"]] = categories.get(t["category"], 0) + t["amount_minor"]
+    return summary
+
+
+def _fill(manager, count, seed):
+    rng = random.Random(seed)
+    manager.add_transactions_batch([{
+        "amount_minor": rng.randint(1, 100000),
+        "cat": rng.choice(["Їжа", "Кава", "Транспорт"]),
+        "type_trans": rng.choice(["Доход", "Витрата"]),
+        "desc": "",
+        "date_str": _random_date(rng),
+    } for _ in range(count)])
+
+
+def _random_date(rng):
+    month = rng.randint(1, 6)
+    return f"2025-{month:02d}-{rng.randint(1, calendar.monthrange(2025, month)[1]):02d}"
+
+
+def test_summary_matches_naive_scan_at_month_edges(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_manager, "_current_month", lambda: "2025-05")
+    manager = _manager(tmp_path)
+    _fill(manager, 600, seed=1)
+
+    ranges = [(None, None), ((2025, 1, 1), (2025, 3, 31)), ((2025, 1, 15), (2025, 3, 14)),
+              ((2025, 2, 28), (2025, 3, 1)), ((2025, 4, 1), (2025, 6, 30)), ((2025, 3, 10), (2025, 3, 20)),
+              ((2024, 12, 1), (2025, 1, 31)), ((2025, 4, 30), (2025, 5, 1))]
+    for start, end in ranges:
+        start_dt = datetime(*start) if start else None
+        end_dt = datetime(*end) if end else None
+        assert manager.get_summary(start_dt, end_dt) == _naive_summary(manager, start_dt, end_dt), (start, end)
+
+
+def test_elapsed_months_are_closed(tmp_path, monkeypatch):
+    month = ["2025-03"]
+    monkeypatch.setattr(data_manager, "_current_month", lambda: month[0])
+    manager = _manager(tmp_path)
+    _fill(manager, 300, seed=2)
+    assert set(manager._rollups) == {"2025-01", "2025-02"}
+
+    month[0] = "2025-06"
+    assert manager.get_summary() == _naive_summary(manager)
+    assert set(manager._rollups) == {"2025-01", "2025-02", "2025-03", "2025-04", "2025-05"}
+
+    # Deleting a transaction from a closed month updates its rollup.
+    victim = next(t for t in manager.transactions if t["date"].startswith("2025-02"))
+    manager.delete_transaction_by_id(victim["id"])
+    start, end = datetime(2025, 2, 1), datetime(2025, 2, 28)
+    assert manager.get_summary(start, end) == _naive_summary(manager, start, end)
+
+
+def test_stored_rollups_are_reused_only_for_the_same_base(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_manager, "_current_month", lambda: "2025-05")
+    manager = _manager(tmp_path)
+    _fill(manager, 200, seed=3)
+    manager.compact()
+    _fill(manager, 50, seed=4)
+
+    with open(manager.rollups_file, encoding="utf-8") as f:
+        stored = json.load(f)
+    assert stored["journal_offset"] < manager._journal_offset
+
+    reloaded = _manager(tmp_path)
+    assert reloaded._load_stored_rollups() is not None
+    assert reloaded._rollups == manager._rollups
+    assert reloaded.get_summary() == _naive_summary(manager)
+
+    # Another process rewriting the base invalidates the stored rollups: they are rebuilt, not trusted.
+    stored["months"] = {"2025-01": {"count": 1, "totals": {"Доход": 1}, "categories": {}}}
+    stored["base"] = [0, 0, 0]
+    with open(manager.rollups_file, "w", encoding="utf-8") as f:
+        json.dump(stored, f)
+    rebuilt = _manager(tmp_path)
+    assert rebuilt.get_summary() == _naive_summary(manager)